@@ -0,0 +1,63 @@
+"""add_creature_name_search
+
+Revision ID: 3d8a5c2e9f14
+Revises: 9b2e4f1c7a30
+Create Date: 2026-10-18 11:03:27.118540
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d8a5c2e9f14"
+down_revision: Union[str, Sequence[str], None] = "9b2e4f1c7a30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS creature_fts USING fts5("
+    "name, content='creature', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS creature_fts_ai AFTER INSERT ON creature BEGIN "
+    "INSERT INTO creature_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS creature_fts_ad AFTER DELETE ON creature BEGIN "
+    "INSERT INTO creature_fts(creature_fts, rowid, name) "
+    "VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS creature_fts_au AFTER UPDATE OF name ON creature "
+    "BEGIN INSERT INTO creature_fts(creature_fts, rowid, name) "
+    "VALUES ('delete', old.id, old.name); "
+    "INSERT INTO creature_fts(rowid, name) VALUES (new.id, new.name); END",
+    # Index the rows that already exist.
+    "INSERT INTO creature_fts(creature_fts) VALUES ('rebuild')",
+]
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_creature_name_trgm "
+    "ON creature USING gin (name gin_trgm_ops)",
+]
+
+
+def upgrade() -> None:
+    # FTS5 trigram table (SQLite) / pg_trgm GIN index (Postgres) for
+    # GET /creatures/search.
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        statements = SQLITE_SEARCH_DDL
+    elif dialect == "postgresql":
+        statements = POSTGRES_SEARCH_DDL
+    else:
+        return
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("creature_fts_ai", "creature_fts_ad", "creature_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS creature_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_creature_name_trgm")
@@ -0,0 +1,59 @@
+"""creature_class_fk
+
+Revision ID: 5e7a1c9d4b26
+Revises: c41f07d2b8e5
+Create Date: 2026-10-18 15:02:41.118203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e7a1c9d4b26"
+down_revision: Union[str, Sequence[str], None] = "c41f07d2b8e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Plain ALTERs (no batch mode) so SQLite keeps the FTS triggers on creature.
+    if op.get_bind().dialect.name == "sqlite":
+        # SQLite can only declare the foreign key inline with ADD COLUMN.
+        op.execute(
+            "ALTER TABLE creature ADD COLUMN class_id INTEGER "
+            "REFERENCES creatureclass (id) ON DELETE SET NULL"
+        )
+    else:
+        op.add_column("creature", sa.Column("class_id", sa.Integer(), nullable=True))
+        op.create_foreign_key(
+            "fk_creature_class_id",
+            "creature",
+            "creatureclass",
+            ["class_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+
+    # Register classes that creatures use but nobody created, as the API does.
+    op.execute(
+        "INSERT INTO creatureclass (name, color, border_color, text_color) "
+        "SELECT DISTINCT creature_type, 'rgba(127,19,236,0.1)', "
+        "'rgba(127,19,236,0.2)', '#ad92c9' FROM creature "
+        "WHERE creature_type NOT IN (SELECT name FROM creatureclass)"
+    )
+    op.execute(
+        "UPDATE creature SET class_id = (SELECT creatureclass.id FROM creatureclass "
+        "WHERE creatureclass.name = creature.creature_type)"
+    )
+    op.create_index("ix_creature_class_id", "creature", ["class_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_creature_class_id", table_name="creature")
+    if op.get_bind().dialect.name != "sqlite":
+        op.drop_constraint("fk_creature_class_id", "creature", type_="foreignkey")
+    op.drop_column("creature", "class_id")
@@ -0,0 +1,36 @@
+"""add_creature_filter_indexes
+
+Revision ID: 9b2e4f1c7a30
+Revises: 6c914bb744c4
+Create Date: 2026-10-18 10:12:41.503218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2e4f1c7a30"
+down_revision: Union[str, Sequence[str], None] = "6c914bb744c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Indexes backing the server-side filters on GET /creatures/.
+    op.create_index(
+        "ix_creature_type_danger",
+        "creature",
+        ["creature_type", "danger_level"],
+        unique=False,
+    )
+    op.create_index("ix_creature_mythology", "creature", ["mythology"], unique=False)
+    op.create_index("ix_creature_habitat", "creature", ["habitat"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_creature_habitat", table_name="creature")
+    op.drop_index("ix_creature_mythology", table_name="creature")
+    op.drop_index("ix_creature_type_danger", table_name="creature")
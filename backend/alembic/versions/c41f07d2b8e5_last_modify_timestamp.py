@@ -0,0 +1,102 @@
+"""last_modify_timestamp
+
+Revision ID: c41f07d2b8e5
+Revises: 3d8a5c2e9f14
+Create Date: 2026-10-18 12:26:05.730914
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41f07d2b8e5"
+down_revision: Union[str, Sequence[str], None] = "3d8a5c2e9f14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _parse_timestamp(value):
+    """Parse a legacy free-form `last_modify` string; None if it is not a timestamp."""
+    try:
+        parsed = datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _copy_column(source, target, convert):
+    """Copy creature.<source> into creature.<target> in id-ordered batches.
+
+    `source` and `target` are typed columns so values round-trip through the
+    same DateTime storage format the application uses.
+    """
+    bind = op.get_bind()
+    creature = sa.table("creature", sa.column("id", sa.Integer()), source, target)
+    source, target = source.name, target.name
+    update = (
+        sa.update(creature)
+        .where(creature.c.id == sa.bindparam("_id"))
+        .values({target: sa.bindparam("_value")})
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(creature.c.id, creature.c[source])
+            .where(creature.c.id > last_id)
+            .order_by(creature.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            update, [{"_id": row[0], "_value": convert(row[1])} for row in rows]
+        )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    # Plain ALTERs (no batch mode) so SQLite keeps the FTS triggers on creature.
+    op.add_column(
+        "creature",
+        sa.Column("last_modify_ts", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Legacy values that are not ISO timestamps (e.g. "Unknown") become NULL.
+    _copy_column(
+        sa.column("last_modify", sa.String()),
+        sa.column("last_modify_ts", sa.DateTime(timezone=True)),
+        _parse_timestamp,
+    )
+    op.drop_column("creature", "last_modify")
+    op.alter_column("creature", "last_modify_ts", new_column_name="last_modify")
+    op.create_index(
+        "ix_creature_last_modify", "creature", ["last_modify", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_creature_last_modify", table_name="creature")
+    op.add_column(
+        "creature",
+        sa.Column(
+            "last_modify_str",
+            sa.String(),
+            nullable=False,
+            server_default="Unknown",
+        ),
+    )
+    _copy_column(
+        sa.column("last_modify", sa.DateTime(timezone=True)),
+        sa.column("last_modify_str", sa.String()),
+        lambda value: value.isoformat() if value is not None else "Unknown",
+    )
+    op.drop_column("creature", "last_modify")
+    op.alter_column("creature", "last_modify_str", new_column_name="last_modify")
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 import logging
 from fastapi import FastAPI
@@ -12,6 +13,9 @@ from contextvars import ContextVar
 import os
 from app.routers import auth
 from app.routers import tags
+from app.routers import internal
+from app.queue import create_arq_pool
+from app import class_registry, db, response_cache
 from pathlib import Path
 
 
@@ -20,6 +24,40 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Delay between attempts to reach Redis after it was unavailable at startup.
+REDIS_RETRY_MIN_SECONDS = 1.0
+REDIS_RETRY_MAX_SECONDS = 60.0
+
+
+def use_arq_pool(app: FastAPI, pool) -> None:
+    """Install the Redis pool for enqueueing; classes are served from memory,
+    and the pool also carries their version counter and the shared response
+    cache."""
+    app.state.arq_pool = pool
+    class_registry.configure(pool)
+    response_cache.configure(pool)
+
+
+async def connect_arq_pool_with_backoff(app: FastAPI) -> None:
+    """Keep trying to reach Redis (with exponential backoff) until it answers.
+
+    Until then writes are accepted but their image jobs are not enqueued
+    (each one is logged), and the registry and response cache run locally.
+    """
+    delay = REDIS_RETRY_MIN_SECONDS
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            pool = await create_arq_pool()
+        except Exception as e:
+            delay = min(delay * 2, REDIS_RETRY_MAX_SECONDS)
+            logger.warning(f"Redis still unavailable, retrying in {delay:.0f}s: {e}")
+            continue
+        use_arq_pool(app, pool)
+        logger.info("Connected to Redis; image jobs are enqueued again.")
+        return
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     try:
@@ -45,8 +83,30 @@ async def lifespan(app: FastAPI):
         logger.exception(f"Migration/Seed failed: {e}")
         raise  # fail-fast (חשוב ל-CI)
 
+    # One Redis pool for the whole process instead of one connection per POST.
+    app.state.arq_pool = None
+    reconnect = None
+    try:
+        use_arq_pool(app, await create_arq_pool())
+    except Exception as e:
+        logger.warning(f"Redis unavailable, retrying in the background: {e}")
+        reconnect = asyncio.create_task(connect_arq_pool_with_backoff(app))
+    await class_registry.list_classes()
+
     yield
 
+    if reconnect is not None:
+        reconnect.cancel()
+    class_registry.configure(None)
+    response_cache.configure(None)
+    if app.state.arq_pool is not None:
+        await app.state.arq_pool.aclose()
+    await db.async_engine.dispose()
+    if db.async_writer_engine is not None:
+        await db.async_writer_engine.dispose()
+    for replica in db.async_read_engines:
+        await replica.dispose()
+
 
 app = FastAPI(lifespan=lifespan)
 
@@ -109,6 +169,20 @@ async def log_exceptions(request: Request, call_next):
         request_id_context.reset(token)
 
 
+@app.middleware("http")
+async def pin_reads_after_writes(request: Request, call_next):
+    # With read replicas, a client that just wrote reads from the primary for
+    # a short window so it sees its own changes despite replication lag.
+    response = await call_next(request)
+    if (
+        db.async_read_engines
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        db.mark_recent_write(response)
+    return response
+
+
 BASE_DIR = Path(__file__).resolve().parents[1]  # backend/
 STATIC_DIR = Path(os.getenv("STATIC_DIR", BASE_DIR / "static"))
 CREATURES_DIR = Path(os.getenv("CREATURES_DIR", STATIC_DIR / "creatures"))
@@ -121,6 +195,7 @@ app.include_router(creatures.router)
 app.include_router(classes.router)
 app.include_router(auth.router)
 app.include_router(tags.router)
+app.include_router(internal.router)
 
 
 @app.get("/")
@@ -0,0 +1,66 @@
+"""In-process cache for derived read models (stats, facets, ...).
+
+Entries are stored under the data generation that was current when they were
+computed. Every committed write that changes creature data calls
+`bump_generation()`, so readers never see results computed before the write.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+# Upper bound on entries so per-filter-combination keys cannot grow unbounded.
+MAX_ENTRIES = int(os.getenv("READ_CACHE_MAX_ENTRIES", "1024"))
+
+_lock = threading.Lock()
+_generation = 0
+_entries: dict[Hashable, tuple[int, float, Any]] = {}
+
+
+def get_generation() -> int:
+    return _generation
+
+
+def bump_generation() -> None:
+    """Invalidate every cached entry. Call after the write has committed."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+
+
+async def get_or_compute(
+    key: Hashable,
+    compute: Callable[[], Awaitable[Any]],
+    max_age: Optional[float] = None,
+) -> Any:
+    """Return the cached value for `key`, computing and storing it on a miss.
+
+    `max_age` (seconds) additionally expires entries whose value depends on the
+    clock (e.g. "last 24 hours" windows) even when no write has happened.
+    """
+    generation = _generation
+    now = time.monotonic()
+    entry = _entries.get(key)
+    if entry is not None:
+        entry_generation, stored_at, value = entry
+        if entry_generation == generation and (
+            max_age is None or now - stored_at < max_age
+        ):
+            return value
+
+    value = await compute()
+    with _lock:
+        # A write may have landed while computing; only store under the
+        # generation the computation started from.
+        if generation == _generation:
+            if len(_entries) >= MAX_ENTRIES:
+                _entries.clear()
+            _entries[key] = (generation, now, value)
+    return value
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,93 @@
+"""In-process registry of creature classes.
+
+Every API process keeps the (small) class table in memory, so listing classes
+and checking whether a creature's class exists need no query. Writes that
+change classes call `invalidate()` after committing, which bumps a version
+counter in Redis; each lookup compares that counter (one Redis GET) with the
+version it loaded, so other processes pick the change up on their next
+request. Without Redis, entries are reloaded after `FALLBACK_MAX_AGE` seconds.
+"""
+
+import logging
+import os
+import time
+from typing import Optional
+from redis.asyncio import Redis
+from sqlmodel import select
+from app import db
+from app.models import CreatureClass, CreatureClassRead
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "bestiary:classes:version"
+FALLBACK_MAX_AGE = float(os.getenv("CLASS_REGISTRY_MAX_AGE", "5"))
+
+_redis: Optional[Redis] = None
+_classes: Optional[list[CreatureClassRead]] = None
+_by_name: dict[str, CreatureClassRead] = {}
+_version: Optional[int] = None
+_loaded_at = 0.0
+
+
+def configure(redis: Optional[Redis]) -> None:
+    """Use `redis` (e.g. the shared arq pool) for the version counter."""
+    global _redis
+    _redis = redis
+    clear()
+
+
+async def _remote_version() -> Optional[int]:
+    if _redis is None:
+        return None
+    try:
+        return int(await _redis.get(VERSION_KEY) or 0)
+    except Exception as e:
+        logger.warning(f"Class registry version unavailable: {e}")
+        return None
+
+
+async def _current() -> list[CreatureClassRead]:
+    global _classes, _by_name, _version, _loaded_at
+    version = await _remote_version()
+    if _classes is not None:
+        if version is not None and version == _version:
+            return _classes
+        if version is None and time.monotonic() - _loaded_at < FALLBACK_MAX_AGE:
+            return _classes
+
+    # Always load from the primary: a lagging replica must not be cached
+    # under the new version. The version is read first, so a change landing
+    # during the load is picked up by the next lookup.
+    async with db.new_session() as session:
+        rows = (
+            await session.exec(select(CreatureClass).order_by(CreatureClass.id))
+        ).all()
+    classes = [CreatureClassRead.model_validate(row) for row in rows]
+    _classes, _version, _loaded_at = classes, version, time.monotonic()
+    _by_name = {c.name: c for c in classes}
+    return classes
+
+
+async def list_classes() -> list[CreatureClassRead]:
+    return await _current()
+
+
+async def get(name: str) -> Optional[CreatureClassRead]:
+    await _current()
+    return _by_name.get(name)
+
+
+async def invalidate() -> None:
+    """Announce a class change to every process. Call after the commit."""
+    clear()
+    if _redis is not None:
+        try:
+            await _redis.incr(VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Class registry version not bumped: {e}")
+
+
+def clear() -> None:
+    """Drop this process's copy; the next lookup reloads it."""
+    global _classes, _by_name, _version
+    _classes, _by_name, _version = None, {}, None
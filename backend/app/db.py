@@ -1,27 +1,367 @@
+import itertools
 import os
+import threading
+import time
 from typing import Annotated
-from fastapi import Depends
+from fastapi import Depends, Request, Response
+from sqlalchemy import event, exc
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 # Database setup.
 # Uses `DATABASE_URL` environment variable, defaulting to SQLite for local development.
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./creatures.db")
 
+# Async drivers for the same databases (both are project dependencies).
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto its async driver, e.g. sqlite -> sqlite+aiosqlite."""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+# Optional read replicas (comma-separated URLs), used round-robin by GET routes.
+DATABASE_READ_URLS = [
+    url.strip() for url in os.getenv("DATABASE_READ_URLS", "").split(",") if url.strip()
+]
+# After a client writes, its reads go to the primary for this many seconds so
+# it sees its own changes despite replication lag.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_COOKIE = "bestiary_primary_until"
+
+# Connection pool sizing, per engine and per process: with N uvicorn workers
+# the database sees up to N * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))  # seconds; -1 = never
+# "always": ping on every checkout (one extra round-trip each time);
+# "idle": ping only connections idle for DB_POOL_PING_IDLE_SECONDS or more;
+# "off": rely on DB_POOL_RECYCLE and error handling.
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "always").lower()
+DB_POOL_PING_IDLE_SECONDS = float(os.getenv("DB_POOL_PING_IDLE_SECONDS", "30"))
+
+# File-based SQLite profile. "production" applies the pragmas below on every
+# connection and funnels request writes through a single writer connection;
+# "default" leaves SQLite's stock (rollback-journal) behaviour.
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "production").lower()
+SQLITE_PRAGMAS = {
+    # Readers no longer block on the writer (and vice versa).
+    "journal_mode": "WAL",
+    # Durable at checkpoints; safe against corruption in WAL mode.
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    # Negative values are KiB rather than pages.
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536")),
+    # Wait for a competing writer (e.g. the worker process) instead of failing.
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+}
+
+
+class PoolWaitStats:
+    """Running totals of the time spent waiting for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            average = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "wait_avg_ms": round(average * 1000, 3),
+                "wait_max_ms": round(self.max_wait * 1000, 3),
+                "wait_total_ms": round(self.total_wait * 1000, 3),
+            }
+
+
+def _timed_pool(pool_class: type, stats: PoolWaitStats) -> type:
+    """Subclass `pool_class` to time every checkout (incl. waits on a full pool).
+
+    The stats live on the class so they survive `Pool.recreate()` (dispose).
+    """
+
+    class TimedPool(pool_class):
+        wait_stats = stats
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                stats.record(time.perf_counter() - start)
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+def _pool_options(url: str, pool_class: type, stats: PoolWaitStats) -> dict:
+    if make_url(url).database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single-connection pool; sizing does not apply.
+        return {"pool_pre_ping": DB_POOL_PRE_PING == "always"}
+    return {
+        "poolclass": _timed_pool(pool_class, stats),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING == "always",
+    }
+
+
+def _is_file_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def _apply_sqlite_pragmas(sync_engine) -> None:
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+class RoutingSession(Session):
+    """Session that reads from `reader` and writes through `writer`.
+
+    Flushes and INSERT/UPDATE/DELETE statements go to the writer; everything
+    else goes to the reader. Once a transaction has written, it stays on the
+    writer until it ends, so it always reads its own changes. Transactions
+    that read before they write are put on the writer up front with
+    `bind_to_writer`.
+    """
+
+    def __init__(self, *args, reader, writer, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reader = reader
+        self.writer = writer
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self._flushing
+            or isinstance(clause, UpdateBase)
+            or self.info.get("bound_to_writer")
+        ):
+            self.info["bound_to_writer"] = True
+            return self.writer
+        return self.reader
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("bound_to_writer", None)
+
+
+def bind_to_writer(session: AsyncSession) -> None:
+    """Run the session's current (or next) transaction on the writer.
+
+    Write services call this before their first SELECT, so the rows they
+    check are the rows they change and the transaction never spans both
+    connections. A no-op for sessions without a separate writer.
+    """
+    session.sync_session.info["bound_to_writer"] = True
+
+
+def _ping_when_idle(sync_engine, idle_seconds: float) -> None:
+    """Pre-ping only connections that sat in the pool for `idle_seconds`.
+
+    Busy connections are handed out without the extra round-trip; a failed
+    ping raises DisconnectionError, which makes the pool retry with a fresh
+    connection exactly like `pool_pre_ping` does.
+    """
+
+    @event.listens_for(sync_engine, "checkin")
+    def _stamp(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _ping(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            alive = sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            raise exc.DisconnectionError() from e
+        if not alive:
+            raise exc.DisconnectionError()
+
+
 connect_args = {}
 if DATABASE_URL.startswith("sqlite"):
     # SQLite-specific configuration for thread safety.
     connect_args = {"check_same_thread": False}
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args, pool_pre_ping=True)
+# The sync engine serves migrations, seeding and CLI scripts; request handlers
+# and the worker use the async engine so DB I/O never blocks the event loop.
+pool_wait_stats = {"sync": PoolWaitStats(), "async": PoolWaitStats()}
+engine = create_engine(
+    DATABASE_URL,
+    connect_args=connect_args,
+    **_pool_options(DATABASE_URL, QueuePool, pool_wait_stats["sync"]),
+)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args=connect_args,
+    **_pool_options(
+        ASYNC_DATABASE_URL, AsyncAdaptedQueuePool, pool_wait_stats["async"]
+    ),
+)
+async_writer_engine = None
+if SQLITE_PROFILE == "production" and _is_file_sqlite(ASYNC_DATABASE_URL):
+    # SQLite allows one writer at a time: queue request writes on a single
+    # connection in-process instead of letting them race for the file lock.
+    pool_wait_stats["async-writer"] = PoolWaitStats()
+    async_writer_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        connect_args=connect_args,
+        **(
+            _pool_options(
+                ASYNC_DATABASE_URL,
+                AsyncAdaptedQueuePool,
+                pool_wait_stats["async-writer"],
+            )
+            | {"pool_size": 1, "max_overflow": 0}
+        ),
+    )
+async_read_engines = []
+for _index, _url in enumerate(DATABASE_READ_URLS):
+    _read_url = to_async_url(_url)
+    pool_wait_stats[f"async-read-{_index}"] = PoolWaitStats()
+    async_read_engines.append(
+        create_async_engine(
+            _read_url,
+            connect_args=(
+                {"check_same_thread": False} if _read_url.startswith("sqlite") else {}
+            ),
+            **_pool_options(
+                _read_url,
+                AsyncAdaptedQueuePool,
+                pool_wait_stats[f"async-read-{_index}"],
+            ),
+        )
+    )
+_replica_counter = itertools.count()
+
+for _engine in (engine, async_engine, async_writer_engine, *async_read_engines):
+    if _engine is None:
+        continue
+    _sync_engine = getattr(_engine, "sync_engine", _engine)
+    if SQLITE_PROFILE == "production" and _is_file_sqlite(str(_engine.url)):
+        _apply_sqlite_pragmas(_sync_engine)
+    if DB_POOL_PRE_PING == "idle":
+        _ping_when_idle(_sync_engine, DB_POOL_PING_IDLE_SECONDS)
+
+
+def pool_status(pool) -> dict:
+    """Live occupancy of a pool plus its checkout wait times (if timed)."""
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            timeout=pool.timeout(),
+        )
+    stats = getattr(pool, "wait_stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
 
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
 
-def get_session():
-    with Session(engine) as session:
+def dialect_insert(session: AsyncSession, model):
+    """`INSERT` construct for the session's dialect, so `on_conflict_do_nothing`
+    and `on_conflict_do_update` are available (with RETURNING on both)."""
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+def new_session() -> AsyncSession:
+    # Objects stay usable after commit without a lazy refresh (which async
+    # sessions cannot do implicitly).
+    if async_writer_engine is None:
+        return AsyncSession(async_engine, expire_on_commit=False)
+    return AsyncSession(
+        sync_session_class=RoutingSession,
+        reader=async_engine.sync_engine,
+        writer=async_writer_engine.sync_engine,
+        expire_on_commit=False,
+    )
+
+
+async def get_session():
+    async with new_session() as session:
+        yield session
+
+
+def mark_recent_write(response: Response) -> None:
+    """Pin the client's reads to the primary for the read-your-writes window."""
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        f"{time.time() + READ_YOUR_WRITES_SECONDS:.3f}",
+        max_age=max(int(READ_YOUR_WRITES_SECONDS) + 1, 1),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def wrote_recently(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_session(request: Request):
+    """Session for read-only routes: a replica (round-robin) when configured.
+
+    Falls back to the primary when there are no replicas or when this client
+    wrote within the last READ_YOUR_WRITES_SECONDS.
+    """
+    if not async_read_engines or wrote_recently(request):
+        session = new_session()
+    else:
+        replica = async_read_engines[next(_replica_counter) % len(async_read_engines)]
+        session = AsyncSession(replica, expire_on_commit=False)
+    async with session:
         yield session
 
 
-SessionDep = Annotated[Session, Depends(get_session)]
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
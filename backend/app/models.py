@@ -1,5 +1,7 @@
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Literal, Optional
 from typing import Annotated
+from sqlalchemy import DDL, DateTime, Index, TypeDecorator, event
 from sqlmodel import SQLModel, Field
 from pydantic import Field as PydField, field_validator
 from pydantic import constr
@@ -11,6 +13,29 @@ NonEmptyStr = constr(min_length=1, strip_whitespace=True)
 NON_BLANK_PATTERN = r"^.*\S.*$"
 
 
+class UTCDateTime(TypeDecorator):
+    """Timezone-aware timestamp that is always stored and returned in UTC.
+
+    Postgres stores it as TIMESTAMPTZ; SQLite has no timezone support, so the
+    value is normalized to UTC before binding and tagged as UTC when loaded.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+
 class CreatureBase(SQLModel):
     name: Annotated[NonEmptyStr, PydField(pattern=NON_BLANK_PATTERN)] = Field(
         index=True,
@@ -36,16 +61,69 @@ class CreatureBase(SQLModel):
     habitat: Annotated[NonEmptyStr, PydField(pattern=NON_BLANK_PATTERN)] = Field(
         default="Unknown"
     )
-    last_modify: Annotated[NonEmptyStr, PydField(pattern=NON_BLANK_PATTERN)] = Field(
-        default="Unknown"
-    )
+    last_modify: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
     image_url: Optional[str] = Field(default=None)
     image_status: str = Field(default="pending")  # Status: pending, ready, failed
     image_error: Optional[str] = Field(default=None)
 
 
 class Creature(CreatureBase, table=True):
+    # Indexes backing the server-side filters on GET /creatures/.
+    __table_args__ = (
+        # Matches the migrations; imports upsert against it (ON CONFLICT (name)).
+        Index("ix_creature_name", "name", unique=True),
+        Index("ix_creature_type_danger", "creature_type", "danger_level"),
+        Index("ix_creature_mythology", "mythology"),
+        Index("ix_creature_habitat", "habitat"),
+        # Time-range filters and the recency keyset (last_modify, id).
+        Index("ix_creature_last_modify", "last_modify", "id"),
+        Index("ix_creature_class_id", "class_id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
+    # Set from `creature_type` on every write; lets listings join the class.
+    class_id: Optional[int] = Field(
+        default=None, foreign_key="creatureclass.id", ondelete="SET NULL"
+    )
+
+
+# Name search index: an FTS5 trigram table kept in sync by triggers on SQLite,
+# a pg_trgm GIN index on Postgres, for `create_all` (tests, seeding). Migration
+# 3d8a5c2e9f14 keeps its own frozen copy: a change here needs a new migration.
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS creature_fts USING fts5("
+    "name, content='creature', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS creature_fts_ai AFTER INSERT ON creature BEGIN "
+    "INSERT INTO creature_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS creature_fts_ad AFTER DELETE ON creature BEGIN "
+    "INSERT INTO creature_fts(creature_fts, rowid, name) "
+    "VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS creature_fts_au AFTER UPDATE OF name ON creature "
+    "BEGIN INSERT INTO creature_fts(creature_fts, rowid, name) "
+    "VALUES ('delete', old.id, old.name); "
+    "INSERT INTO creature_fts(rowid, name) VALUES (new.id, new.name); END",
+    # Index the rows that already exist.
+    "INSERT INTO creature_fts(creature_fts) VALUES ('rebuild')",
+]
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_creature_name_trgm "
+    "ON creature USING gin (name gin_trgm_ops)",
+]
+
+for _stmt in SQLITE_SEARCH_DDL:
+    event.listen(
+        Creature.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite")
+    )
+for _stmt in POSTGRES_SEARCH_DDL:
+    event.listen(
+        Creature.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql")
+    )
+event.listen(
+    Creature.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS creature_fts").execute_if(dialect="sqlite"),
+)
 
 
 class CreatureCreate(CreatureBase):
@@ -56,6 +134,62 @@ class CreatureRead(CreatureBase):
     id: int
 
 
+class CreatureFilter(SQLModel):
+    """Server-side filters for creature listings (all criteria are ANDed)."""
+
+    q: Optional[str] = None  # case-insensitive name substring
+    creature_type: list[str] = Field(default_factory=list)
+    mythology: list[str] = Field(default_factory=list)
+    habitat: list[str] = Field(default_factory=list)
+    min_danger: Optional[int] = None
+    max_danger: Optional[int] = None
+    modified_since: Optional[datetime] = None
+
+
+class CreatureStats(SQLModel):
+    total: int
+    critical: int  # danger_level >= CRITICAL_DANGER_LEVEL
+    added_this_month: int
+    added_last_24h: int
+
+
+class FacetValue(SQLModel):
+    value: str
+    count: int
+
+
+class CreatureFacets(SQLModel):
+    creature_type: list[FacetValue]
+    mythology: list[FacetValue]
+    habitat: list[FacetValue]
+
+
+class BulkItemResult(SQLModel):
+    index: int  # position in the request body
+    status: Literal["created", "invalid", "conflict"]
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BulkCreateResult(SQLModel):
+    created: int
+    failed: int
+    items: list[BulkItemResult]
+
+
+class ImportReject(SQLModel):
+    line: int  # line (NDJSON) or record end line (CSV) in the uploaded file
+    detail: str
+
+
+class ImportSummary(SQLModel):
+    processed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    rejected: int = 0
+    rejects: list[ImportReject] = Field(default_factory=list)  # first few only
+
+
 class CreatureClassBase(SQLModel):
     name: NonEmptyStr = Field(index=True, unique=True)
     color: str = Field(default="rgba(127,19,236,0.1)")  # CSS background color
@@ -64,6 +198,10 @@ class CreatureClassBase(SQLModel):
 
 
 class CreatureClass(CreatureClassBase, table=True):
+    # Matches the migrations; `unique=True` on an annotated field is not
+    # picked up by create_all, and inserts rely on it (ON CONFLICT (name)).
+    __table_args__ = (Index("ix_creatureclass_name", "name", unique=True),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
 
 
@@ -75,6 +213,20 @@ class CreatureClassRead(CreatureClassBase):
     id: int
 
 
+class CreatureClassStyle(SQLModel):
+    """Badge colors of a creature's class, embedded in creature listings."""
+
+    color: str
+    border_color: str
+    text_color: str
+
+
+class CreatureListItem(CreatureRead):
+    class_id: Optional[int] = None
+    # None when the creature's class is not registered.
+    creature_class: Optional[CreatureClassStyle] = None
+
+
 class CreatureClassUpdate(SQLModel):
     name: Optional[NonEmptyStr] = None
     color: Optional[NonEmptyStr] = None
@@ -0,0 +1,150 @@
+"""Helpers for enqueueing arq jobs from the API."""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Annotated, Any, Iterable, Optional
+from uuid import uuid4
+
+import arq
+from arq.connections import ArqRedis, RedisSettings
+from arq.constants import job_key_prefix
+from arq.jobs import serialize_job
+from arq.utils import timestamp_ms
+from fastapi import Depends, Request
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Creature fields the image prompt is built from.
+IMAGE_PROMPT_FIELDS = ("name", "creature_type", "mythology", "habitat")
+# Id of the latest image job enqueued for a creature (see replace_image_job).
+IMAGE_JOB_KEY = "bestiary:image-job:{}"
+
+
+async def create_arq_pool() -> ArqRedis:
+    """Connect to the Redis named by `REDIS_URL` (host, port, password and db)."""
+    return await arq.create_pool(RedisSettings.from_dsn(REDIS_URL))
+
+
+def get_arq_pool(request: Request) -> Optional[ArqRedis]:
+    """The app-wide pool opened in the lifespan; None if Redis was unreachable."""
+    return getattr(request.app.state, "arq_pool", None)
+
+
+ArqPoolDep = Annotated[Optional[ArqRedis], Depends(get_arq_pool)]
+
+
+def image_content_hash(creature: Any) -> str:
+    """Short hash of the fields that shape a creature's generated image."""
+    values = json.dumps([getattr(creature, field) for field in IMAGE_PROMPT_FIELDS])
+    return hashlib.blake2b(values.encode(), digest_size=8).hexdigest()
+
+
+def image_job(
+    creature_id: int, creature: Any, request_id: Optional[str] = None
+) -> tuple[tuple[Any, ...], dict[str, Any]]:
+    """`(args, kwargs)` for `enqueue_jobs` of the image job for `creature`.
+
+    The job id is deterministic (creature id and content hash), so enqueueing
+    the same creature content again while a job for it is queued or running
+    is a no-op.
+    """
+    content_hash = image_content_hash(creature)
+    return (creature_id,), {
+        "request_id": request_id,
+        "content_hash": content_hash,
+        "_job_id": f"image:{creature_id}:{content_hash}",
+    }
+
+
+async def enqueue_jobs(
+    pool: ArqRedis,
+    function: str,
+    calls: Iterable[tuple[tuple[Any, ...], dict[str, Any]]],
+    defer_by_ms: Optional[int] = None,
+) -> list[str]:
+    """Enqueue many jobs for `function` in a single Redis round-trip.
+
+    `calls` yields `(args, kwargs)` per job. Jobs are written exactly as
+    `ArqRedis.enqueue_job` writes them (serialized job key + queue entry), but
+    through one non-transactional pipeline instead of a WATCH/MULTI per job.
+
+    Like `enqueue_job`, a `_job_id` in kwargs names the job (ids are random
+    otherwise). Both writes are NX, so a job whose id is already queued or
+    running is left as it is; unlike `enqueue_job`, a finished job's kept
+    result does not block running it again. Returns the ids that were new.
+
+    This relies on arq's storage layout, hence the exact arq pin in
+    pyproject.toml; upgrades must keep the round-trip test passing.
+    """
+    enqueue_time_ms = timestamp_ms()
+    score = enqueue_time_ms + (defer_by_ms or 0)
+    expires_ms = score - enqueue_time_ms + pool.expires_extra_ms
+
+    job_ids = []
+    async with pool.pipeline(transaction=False) as pipe:
+        for args, kwargs in calls:
+            kwargs = dict(kwargs)
+            job_id = kwargs.pop("_job_id", None) or uuid4().hex
+            job = serialize_job(
+                function,
+                args,
+                kwargs,
+                None,
+                enqueue_time_ms,
+                serializer=pool.job_serializer,
+            )
+            pipe.set(job_key_prefix + job_id, job, px=expires_ms, nx=True)
+            pipe.zadd(pool.default_queue_name, {job_id: score}, nx=True)
+            job_ids.append(job_id)
+        if not job_ids:
+            return []
+        results = await pipe.execute()
+    # One (SET, ZADD) reply pair per job; SET NX answers None for duplicates.
+    return [job_id for job_id, new in zip(job_ids, results[::2]) if new]
+
+
+async def cancel_job(pool: ArqRedis, job_id: str) -> None:
+    """Drop a queued job. If a worker already picked it up, it runs anyway
+    (image jobs then notice they are stale and stop)."""
+    async with pool.pipeline(transaction=False) as pipe:
+        pipe.zrem(pool.default_queue_name, job_id)
+        pipe.delete(job_key_prefix + job_id)
+        await pipe.execute()
+
+
+async def replace_image_job(
+    pool: ArqRedis,
+    creature: Any,
+    request_id: Optional[str] = None,
+    defer_by_ms: Optional[int] = None,
+) -> None:
+    """Enqueue the image job for `creature`'s current content, cancelling the
+    one enqueued for it before.
+
+    With `defer_by_ms`, edits that land within that window keep replacing the
+    deferred job, so only the last one reaches ai-service.
+    """
+    args, kwargs = image_job(creature.id, creature, request_id)
+    job_id = kwargs["_job_id"]
+    previous = await pool.set(
+        IMAGE_JOB_KEY.format(creature.id),
+        job_id,
+        px=(defer_by_ms or 0) + pool.expires_extra_ms,
+        get=True,
+    )
+    if previous is not None and previous.decode() != job_id:
+        await cancel_job(pool, previous.decode())
+    await enqueue_jobs(
+        pool, "generate_creature_image", [(args, kwargs)], defer_by_ms=defer_by_ms
+    )
+
+
+async def cancel_image_job(pool: ArqRedis, creature_id: int) -> None:
+    """Cancel the latest image job enqueued for a (deleted) creature."""
+    previous = await pool.getdel(IMAGE_JOB_KEY.format(creature_id))
+    if previous is not None:
+        await cancel_job(pool, previous.decode())
@@ -0,0 +1,57 @@
+"""Token-bucket rate limiting shared across processes through Redis.
+
+The bucket lives in one Redis hash (tokens left, time of the last refill) and
+is refilled and drawn from atomically by a Lua script, using the Redis server
+clock so workers on different hosts agree. A caller that finds the bucket
+empty is told how long until the next token and sleeps that long before
+trying again.
+"""
+
+import asyncio
+from redis.asyncio import Redis
+
+# KEYS[1] = bucket, ARGV[1] = tokens per second, ARGV[2] = bucket size.
+# Returns 0 if a token was taken, otherwise milliseconds until one is due.
+_TAKE_TOKEN = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = time[1] * 1000 + time[2] / 1000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return wait
+"""
+
+
+class TokenBucket:
+    """At most `rate` acquisitions per second on average, bursts up to `burst`."""
+
+    def __init__(self, redis: Redis, key: str, rate: float, burst: int):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.key = key
+        self.rate = rate
+        self.burst = burst
+        self._take_token = redis.register_script(_TAKE_TOKEN)
+
+    async def acquire(self) -> float:
+        """Wait for a token; return the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            wait_ms = await self._take_token(
+                keys=[self.key], args=[self.rate, self.burst]
+            )
+            if not wait_ms:
+                return waited
+            await asyncio.sleep(wait_ms / 1000)
+            waited += wait_ms / 1000
@@ -0,0 +1,188 @@
+"""Shared (Redis) cache of serialized responses for hot read endpoints.
+
+Entries hold the exact response bytes (plus headers such as `Link`), tagged
+with the global data generation that was current when they were rendered.
+Writes call `bump_generation()` after committing, which increments the
+generation in Redis, so every API process stops serving older entries at
+once. A lookup fetches the generation and the entry in one MGET. A process
+that sees a newer generation than it last saw also drops its in-process
+`app.cache` entries before rendering, so it never re-caches results computed
+before another process's write.
+
+Image status changes (from the worker) only bump a second, image generation,
+which invalidates the responses that show images (`serve(...,
+shows_images=True)`, i.e. the creature list) and leaves stats and facets
+cached.
+
+Without Redis every request is rendered as before.
+
+JSON responses also carry a strong ETag (a hash of the body, stored with
+cached entries), and `conditional()` answers a matching `If-None-Match` with
+`304 Not Modified` and no body.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from app import cache, db
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = "bestiary:data:generation"
+IMAGE_GENERATION_KEY = "bestiary:data:image-generation"
+KEY_PREFIX = "bestiary:response:"
+# Also bounds time-window staleness (stats) and entries rendered from a
+# lagging read replica.
+RESPONSE_CACHE_SECONDS = float(os.getenv("RESPONSE_CACHE_SECONDS", "60"))
+
+# Headers recomputed by Starlette rather than replayed from the cache.
+_SKIPPED_HEADERS = {"content-length", "content-type"}
+
+_redis: Optional[Redis] = None
+# The Redis generation this process's `app.cache` entries were computed under.
+_seen_generation: Optional[int] = None
+
+
+def configure(redis: Optional[Redis]) -> None:
+    """Use `redis` (e.g. the shared arq pool) for cached responses."""
+    global _redis, _seen_generation
+    _redis = redis
+    _seen_generation = None
+
+
+async def bump_generation(redis: Optional[Redis] = None) -> None:
+    """Invalidate cached reads, here and in every process. Call after the commit.
+
+    `redis` overrides the configured client (the worker passes its own).
+    """
+    cache.bump_generation()
+    redis = redis or _redis
+    if redis is not None:
+        try:
+            await redis.incr(GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"Response cache generation not bumped: {e}")
+
+
+async def bump_image_generation(redis: Optional[Redis] = None) -> None:
+    """Invalidate cached responses that show creature images (the list).
+
+    For image status changes, which stats and facets do not depend on.
+    """
+    redis = redis or _redis
+    if redis is not None:
+        try:
+            await redis.incr(IMAGE_GENERATION_KEY)
+        except Exception as e:
+            logger.warning(f"Response cache image generation not bumped: {e}")
+
+
+def _sync_local_cache(generation: int) -> None:
+    """Drop in-process entries computed before a write seen through Redis."""
+    global _seen_generation
+    if generation != _seen_generation:
+        cache.bump_generation()
+        _seen_generation = generation
+
+
+def json_response(adapter: TypeAdapter, value: Any) -> Response:
+    """Serialize `value` with `adapter` straight to a JSON response with an ETag."""
+    body = adapter.dump_json(value)
+    etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison: a W/ prefix is ignored.
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional(request: Request, response: Response) -> Response:
+    """Answer with `304 Not Modified` if the client already has this ETag."""
+    etag = response.headers.get("etag")
+    if etag is None or not _etag_matches(request.headers.get("if-none-match"), etag):
+        return response
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name not in _SKIPPED_HEADERS
+    }
+    return Response(status_code=304, headers=headers)
+
+
+def _key(request: Request) -> str:
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{KEY_PREFIX}{request.url.netloc}{request.url.path}?{query}"
+
+
+async def serve(
+    request: Request,
+    render: Callable[[], Awaitable[Response]],
+    shows_images: bool = False,
+) -> Response:
+    """Return the cached response for this URL, or `render()` and cache it.
+
+    Set `shows_images` for responses that include image status/URL, so they
+    are also invalidated by `bump_image_generation()`.
+
+    Either way the response is `conditional()`: a hit whose ETag the client
+    already has costs one MGET and no serialization or body.
+    """
+    # Clients pinned to the primary must not see an entry a replica rendered.
+    if _redis is None or (db.async_read_engines and db.wrote_recently(request)):
+        return conditional(request, await render())
+
+    key = _key(request)
+    try:
+        generation, image_generation, entry = await _redis.mget(
+            GENERATION_KEY, IMAGE_GENERATION_KEY, key
+        )
+    except Exception as e:
+        logger.warning(f"Response cache unavailable: {e}")
+        return conditional(request, await render())
+    _sync_local_cache(int(generation or 0))
+    version = b"%d" % int(generation or 0)
+    if shows_images:
+        version += b".%d" % int(image_generation or 0)
+
+    if entry is not None:
+        entry_version, headers, body = entry.split(b"\n", 2)
+        if entry_version == version:
+            response = Response(
+                body,
+                media_type="application/json",
+                headers=json.loads(headers) | {"X-Cache": "hit"},
+            )
+            return conditional(request, response)
+
+    response = await render()
+    if response.status_code == 200:
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name not in _SKIPPED_HEADERS
+        }
+        entry = b"%s\n%s\n%s" % (
+            version,
+            json.dumps(headers).encode(),
+            response.body,
+        )
+        try:
+            await _redis.set(key, entry, px=int(RESPONSE_CACHE_SECONDS * 1000))
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+    response.headers["X-Cache"] = "miss"
+    return conditional(request, response)
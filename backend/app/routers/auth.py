@@ -1,6 +1,7 @@
 from datetime import timedelta
 from typing import Annotated, Literal
 from fastapi import APIRouter, Depends, HTTPException, status, Form
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import select
 from pydantic import BaseModel, Field
 
@@ -12,7 +13,7 @@ from app.auth import (
     get_admin_user,
     ACCESS_TOKEN_EXPIRE_MINUTES,
 )
-from app.db import SessionDep
+from app.db import SessionDep, dialect_insert
 from app.models import User
 
 router = APIRouter(tags=["auth"])
@@ -43,8 +44,11 @@ async def login_for_access_token(
     username: str = Form(..., min_length=1),
     password: str = Form(..., min_length=1),
 ):
-    user = session.exec(select(User).where(User.username == username)).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = (await session.exec(select(User).where(User.username == username))).first()
+    # bcrypt is deliberately slow; keep it off the event loop.
+    if not user or not await run_in_threadpool(
+        verify_password, password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -67,22 +71,27 @@ async def login_for_access_token(
         status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error"},
     },
 )
-def register(payload: RegisterRequest, session: SessionDep):
+async def register(payload: RegisterRequest, session: SessionDep):
     username = payload.username
     password = payload.password
     role = payload.role
 
-    existing = session.exec(select(User).where(User.username == username)).first()
-    if existing:
+    hashed = await run_in_threadpool(get_password_hash, password)
+    # The primary key decides uniqueness; no check-then-insert race.
+    created = (
+        await session.exec(
+            dialect_insert(session, User)
+            .values(username=username, hashed_password=hashed, role=role)
+            .on_conflict_do_nothing(index_elements=[User.username])
+            .returning(User.username)
+        )
+    ).first()
+    if created is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="User already exists",
         )
-
-    hashed = get_password_hash(password)
-    user = User(username=username, hashed_password=hashed, role=role)
-    session.add(user)
-    session.commit()
+    await session.commit()
     return {"username": username, "status": "created"}
 
 
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Path, HTTPException, Response, status
+from fastapi import APIRouter, Path, Request, Response, status
+from pydantic import TypeAdapter
+from app import response_cache
 from app.db import SessionDep
 from app.models import (
-    CreatureClass,
     CreatureClassCreate,
     CreatureClassRead,
     CreatureClassUpdate,
@@ -22,15 +23,25 @@ router = APIRouter(prefix="/classes", tags=["classes"])
         409: {"description": "Class already exists"},
     },
 )
-def create_class(class_data: CreatureClassCreate, session: SessionDep):
+async def create_class(class_data: CreatureClassCreate, session: SessionDep):
     """Create a new creature class."""
-    return service.create_class(session, class_data)
+    return await service.create_class(session, class_data)
 
 
-@router.get("/", response_model=list[CreatureClassRead])
-def read_classes(session: SessionDep):
-    """List all available creature classes."""
-    return service.list_classes(session)
+CLASS_LIST = TypeAdapter(list[CreatureClassRead])
+
+
+@router.get(
+    "/",
+    response_model=list[CreatureClassRead],
+    responses={304: {"description": "Not modified (`If-None-Match` matched the ETag)"}},
+)
+async def read_classes(request: Request):
+    """List all available creature classes (served from the in-process registry)."""
+    classes = await service.list_classes()
+    return response_cache.conditional(
+        request, response_cache.json_response(CLASS_LIST, classes)
+    )
 
 
 @router.delete(
@@ -41,13 +52,10 @@ def read_classes(session: SessionDep):
         404: {"description": "Class not found"},
     },
 )
-def delete_class(session: SessionDep, class_id: int = Path(..., ge=1, le=MAX_INT32)):
-    obj = session.get(CreatureClass, class_id)
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Class not found")
-
-    session.delete(obj)
-    session.commit()
+async def delete_class(
+    session: SessionDep, class_id: int = Path(..., ge=1, le=MAX_INT32)
+):
+    await service.delete_class(session, class_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -60,9 +68,9 @@ def delete_class(session: SessionDep, class_id: int = Path(..., ge=1, le=MAX_INT
         409: {"description": "Conflict"},
     },
 )
-def update_class_endpoint(
+async def update_class_endpoint(
     session: SessionDep,
     class_update: CreatureClassUpdate,
     class_id: int = Path(..., ge=1, le=MAX_INT32),
 ) -> CreatureClassRead:
-    return service.update_class(session, class_id, class_update)
+    return await service.update_class(session, class_id, class_update)
@@ -1,13 +1,71 @@
-from fastapi import APIRouter, Path
-from app.models import CreatureCreate, CreatureRead
-from app.db import SessionDep
+import io
+from datetime import datetime
+from typing import Annotated, Any, Optional
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from app.models import (
+    BulkCreateResult,
+    CreatureCreate,
+    CreatureFacets,
+    CreatureFilter,
+    CreatureListItem,
+    CreatureRead,
+    CreatureStats,
+    ImportSummary,
+)
+from app import response_cache
+from app.db import ReadSessionDep, SessionDep
+from app.queue import ArqPoolDep
 from app.services import creatures as service
+from app.services import creature_io
 
 router = APIRouter(prefix="/creatures", tags=["creatures"])
 
 MAX_INT32 = 2_147_483_647
 
 
+def get_creature_filter(
+    q: Optional[str] = Query(None, description="Case-insensitive name substring"),
+    creature_type: list[str] = Query([]),
+    mythology: list[str] = Query([]),
+    habitat: list[str] = Query([]),
+    min_danger: Optional[int] = Query(None, ge=1, le=10),
+    max_danger: Optional[int] = Query(None, ge=1, le=10),
+    modified_since: Optional[datetime] = Query(
+        None, description="Only creatures modified at or after this time (UTC if naive)"
+    ),
+) -> CreatureFilter:
+    return CreatureFilter(
+        q=q,
+        creature_type=creature_type,
+        mythology=mythology,
+        habitat=habitat,
+        min_danger=min_danger,
+        max_danger=max_danger,
+        modified_since=modified_since,
+    )
+
+
+FilterDep = Annotated[CreatureFilter, Depends(get_creature_filter)]
+
+# Serializers for responses built directly (cached and/or ETag-tagged).
+CREATURE = TypeAdapter(CreatureRead)
+CREATURE_LIST = TypeAdapter(list[CreatureListItem])
+STATS = TypeAdapter(CreatureStats)
+FACETS = TypeAdapter(CreatureFacets)
+
+
 @router.post(
     "/",
     response_model=CreatureRead,
@@ -17,29 +75,182 @@ MAX_INT32 = 2_147_483_647
     },
 )
 async def create_creature_endpoint(
-    creature: CreatureCreate, session: SessionDep
+    creature: CreatureCreate, session: SessionDep, pool: ArqPoolDep
 ) -> CreatureRead:
     """Create a new creature and enqueue image generation."""
-    return await service.create_creature(session, creature)
+    return await service.create_creature(session, creature, pool)
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResult,
+    responses={400: {"description": "Malformed JSON body"}},
+)
+async def create_creatures_bulk_endpoint(
+    session: SessionDep,
+    pool: ArqPoolDep,
+    creatures: list[dict[str, Any]] = Body(
+        ..., min_length=1, max_length=service.MAX_BULK_ITEMS
+    ),
+) -> BulkCreateResult:
+    """Create many creatures at once; each item gets its own status.
+
+    Items are validated individually, so invalid entries or name conflicts do
+    not reject the rest of the batch.
+    """
+    return await service.create_creatures_bulk(session, creatures, pool)
+
+
+@router.post(
+    "/import",
+    response_model=ImportSummary,
+    responses={400: {"description": "Unknown format or undecodable file"}},
+)
+async def import_creatures_endpoint(
+    session: SessionDep,
+    pool: ArqPoolDep,
+    file: UploadFile,
+    format: Optional[creature_io.ImportFormat] = Query(
+        None, description="Defaults to the file extension (.ndjson/.jsonl or .csv)"
+    ),
+) -> ImportSummary:
+    """Upsert creatures by name from an NDJSON or CSV file.
+
+    The upload is spooled to disk and processed in batches; invalid records
+    are counted and reported by line instead of failing the whole import.
+    """
+    fmt = format or creature_io.detect_format(file.filename)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Cannot infer file format")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return await creature_io.import_upload(session, stream, fmt, pool)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File is not valid UTF-8")
+    finally:
+        stream.detach()
+
+
+@router.get(
+    "/",
+    response_model=list[CreatureListItem],
+    responses={
+        304: {"description": "Not modified (`If-None-Match` matched the ETag)"},
+        400: {"description": "Invalid cursor"},
+    },
+)
+async def get_creatures_endpoint(
+    request: Request,
+    session: ReadSessionDep,
+    filters: FilterDep,
+    limit: int = Query(service.DEFAULT_PAGE_SIZE, ge=1, le=service.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, min_length=1),
+    sort: service.CreatureSort = Query(
+        "id", description="`id` (oldest first) or `-last_modify` (most recent first)"
+    ),
+) -> list[CreatureListItem]:
+    """List creatures one page at a time, optionally filtered server-side.
+
+    Each creature embeds its class badge colors (`creature_class`).
+
+    The next page (if any) is advertised via the `Link: <...>; rel="next"` and
+    `X-Next-Cursor` response headers.
+    """
 
+    async def render() -> Response:
+        creatures, next_cursor = await service.list_creatures(
+            session, limit, cursor, filters, sort
+        )
+        response = response_cache.json_response(CREATURE_LIST, creatures)
+        if next_cursor:
+            next_url = request.url.include_query_params(cursor=next_cursor)
+            response.headers["Link"] = f'<{next_url}>; rel="next"'
+            response.headers["X-Next-Cursor"] = next_cursor
+        return response
 
-@router.get("/", response_model=list[CreatureRead])
-def get_creatures_endpoint(session: SessionDep) -> list[CreatureRead]:
-    """List all creatures."""
-    return service.list_creatures(session)
+    return await response_cache.serve(request, render, shows_images=True)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "The (filtered) registry, streamed row by row",
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+        }
+    },
+)
+async def export_creatures_endpoint(
+    session: ReadSessionDep,
+    filters: FilterDep,
+    format: creature_io.ExportFormat = Query("ndjson"),
+    include_tags: bool = Query(False),
+) -> StreamingResponse:
+    """Stream every creature as NDJSON or CSV with constant server memory."""
+    return StreamingResponse(
+        creature_io.export_creatures(session, format, include_tags, filters),
+        media_type=creature_io.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="bestiary.{format}"'},
+    )
+
+
+@router.get("/stats", response_model=CreatureStats)
+async def get_creature_stats_endpoint(
+    request: Request, session: ReadSessionDep
+) -> CreatureStats:
+    """Aggregated dashboard counters (total, critical, recent activity)."""
+
+    async def render() -> Response:
+        return response_cache.json_response(STATS, await service.get_stats(session))
+
+    return await response_cache.serve(request, render)
+
+
+@router.get("/facets", response_model=CreatureFacets)
+async def get_creature_facets_endpoint(
+    request: Request, session: ReadSessionDep, filters: FilterDep
+) -> CreatureFacets:
+    """Filter dropdown options with counts, narrowed by the other active filters."""
+
+    async def render() -> Response:
+        facets = await service.get_facets(session, filters)
+        return response_cache.json_response(FACETS, facets)
+
+    return await response_cache.serve(request, render)
+
+
+@router.get("/search", response_model=list[CreatureListItem])
+async def search_creatures_endpoint(
+    session: ReadSessionDep,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+) -> list[CreatureListItem]:
+    """Search creatures by name; best matches first. Like the list, each
+    creature embeds its class badge colors."""
+    return await service.search_creatures(session, q, limit)
 
 
 @router.get(
     "/{creature_id}",
     response_model=CreatureRead,
-    responses={404: {"description": "Creature not found"}},
+    responses={
+        304: {"description": "Not modified (`If-None-Match` matched the ETag)"},
+        404: {"description": "Creature not found"},
+    },
 )
-def get_creature_endpoint(
+async def get_creature_endpoint(
+    request: Request,
     creature_id: int = Path(..., ge=1, le=MAX_INT32),
-    session: SessionDep = ...,
+    session: ReadSessionDep = ...,
 ) -> CreatureRead:
     """Retrieve a specific creature by ID."""
-    return service.get_creature(session, creature_id)
+    creature = CreatureRead.model_validate(
+        await service.get_creature(session, creature_id)
+    )
+    return response_cache.conditional(
+        request, response_cache.json_response(CREATURE, creature)
+    )
 
 
 @router.put(
@@ -47,21 +258,25 @@ def get_creature_endpoint(
     response_model=CreatureRead,
     responses={404: {"description": "Creature not found"}},
 )
-def update_creature_endpoint(
+async def update_creature_endpoint(
     creature_id: int = Path(..., ge=1, le=MAX_INT32),
     creature: CreatureCreate = ...,
     session: SessionDep = ...,
+    pool: ArqPoolDep = ...,
 ) -> CreatureRead:
-    return service.update_creature(session, creature_id, creature)
+    """Update a creature; changes to the image prompt fields (name, type,
+    mythology, habitat) queue a debounced image regeneration."""
+    return await service.update_creature(session, creature_id, creature, pool)
 
 
 @router.delete(
     "/{creature_id}",
     responses={404: {"description": "Creature not found"}},
 )
-def delete_creature_endpoint(
+async def delete_creature_endpoint(
     creature_id: int = Path(..., ge=1, le=MAX_INT32),
     session: SessionDep = ...,
+    pool: ArqPoolDep = ...,
 ) -> dict:
-    service.delete_creature(session, creature_id)
+    await service.delete_creature(session, creature_id, pool)
     return {"detail": "creature deleted successfully"}
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends
+from app import db
+from app.auth import get_admin_user
+
+# Operational endpoints: not part of the public API (hidden from OpenAPI) and
+# restricted to admins, since they expose deployment details.
+router = APIRouter(
+    prefix="/internal",
+    include_in_schema=False,
+    dependencies=[Depends(get_admin_user)],
+)
+
+
+@router.get("/pool")
+def pool_stats():
+    """Connection pool occupancy and checkout wait times for this process.
+
+    Each uvicorn worker has its own pools, so sample every worker (or divide
+    the database's connection budget by the worker count) when sizing.
+    """
+    engines = {
+        "sync": db.pool_status(db.engine.pool),
+        "async": db.pool_status(db.async_engine.sync_engine.pool),
+    }
+    if db.async_writer_engine is not None:
+        engines["async-writer"] = db.pool_status(
+            db.async_writer_engine.sync_engine.pool
+        )
+    for index, replica in enumerate(db.async_read_engines):
+        engines[f"async-read-{index}"] = db.pool_status(replica.sync_engine.pool)
+    return {
+        "settings": {
+            "pool_size": db.DB_POOL_SIZE,
+            "max_overflow": db.DB_MAX_OVERFLOW,
+            "pool_timeout": db.DB_POOL_TIMEOUT,
+            "pool_recycle": db.DB_POOL_RECYCLE,
+            "pre_ping": db.DB_POOL_PRE_PING,
+            "sqlite_profile": db.SQLITE_PROFILE,
+        },
+        "engines": engines,
+    }
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field, TypeAdapter
 from sqlmodel import select
-from app.db import SessionDep
+from app import response_cache
+from app.db import ReadSessionDep, SessionDep, bind_to_writer, dialect_insert
 from app.models import Tag, CreatureTagLink, Creature
 
 router = APIRouter(tags=["tags"])
@@ -11,9 +12,19 @@ class TagCreate(BaseModel):
     name: str = Field(..., min_length=1)
 
 
-@router.get("/tags", response_model=list[Tag])
-def list_tags(session: SessionDep):
-    return session.exec(select(Tag)).all()
+TAG_LIST = TypeAdapter(list[Tag])
+
+
+@router.get(
+    "/tags",
+    response_model=list[Tag],
+    responses={304: {"description": "Not modified (`If-None-Match` matched the ETag)"}},
+)
+async def list_tags(request: Request, session: ReadSessionDep):
+    tags = (await session.exec(select(Tag).order_by(Tag.name))).all()
+    return response_cache.conditional(
+        request, response_cache.json_response(TAG_LIST, tags)
+    )
 
 
 @router.post(
@@ -24,17 +35,18 @@ def list_tags(session: SessionDep):
         409: {"description": "Tag already exists"},
     },
 )
-def create_tag(tag: TagCreate, session: SessionDep):
-    name = tag.name.strip()
-
-    existing = session.get(Tag, name)
-    if existing:
+async def create_tag(tag: TagCreate, session: SessionDep):
+    statement = (
+        dialect_insert(session, Tag)
+        .values(name=tag.name.strip())
+        .on_conflict_do_nothing(index_elements=[Tag.name])
+        .returning(Tag)
+    )
+    new_tag = (await session.exec(statement)).scalars().first()
+    if new_tag is None:
         raise HTTPException(status_code=409, detail="Tag already exists")
-
-    new_tag = Tag(name=name)
-    session.add(new_tag)
-    session.commit()
-    session.refresh(new_tag)
+    await session.commit()
+    await response_cache.bump_generation()
     return new_tag
 
 
@@ -45,14 +57,15 @@ def create_tag(tag: TagCreate, session: SessionDep):
         409: {"description": "Already tagged"},
     },
 )
-def add_tag_to_creature(creature_name: str, tag_name: str, session: SessionDep):
-    creature = session.exec(
-        select(Creature).where(Creature.name == creature_name)
+async def add_tag_to_creature(creature_name: str, tag_name: str, session: SessionDep):
+    bind_to_writer(session)
+    creature = (
+        await session.exec(select(Creature).where(Creature.name == creature_name))
     ).first()
     if not creature:
         raise HTTPException(status_code=404, detail="Creature not found")
 
-    tag = session.get(Tag, tag_name)
+    tag = await session.get(Tag, tag_name)
     if not tag:
         # Tag must exist to be linked.
         raise HTTPException(status_code=404, detail="Tag not found")
@@ -60,9 +73,10 @@ def add_tag_to_creature(creature_name: str, tag_name: str, session: SessionDep):
     link = CreatureTagLink(creature_name=creature_name, tag_name=tag_name)
     session.add(link)
     try:
-        session.commit()
+        await session.commit()
     except Exception:
-        session.rollback()  # Handle duplicate entry.
+        await session.rollback()  # Handle duplicate entry.
         raise HTTPException(status_code=409, detail="Already tagged")
 
+    await response_cache.bump_generation()
     return {"status": "tagged"}
@@ -39,6 +39,7 @@ def seed_data():
                 session.add(CreatureClass(**cls_data))
 
         session.commit()
+        class_ids = dict(session.exec(select(CreatureClass.name, CreatureClass.id)))
 
         # Seed Creatures
         # Using hardcoded image URLs for reproducibility.
@@ -67,7 +68,8 @@ def seed_data():
                 from datetime import datetime, timezone
 
                 db_creature = Creature(**c_data)
-                db_creature.last_modify = datetime.now(timezone.utc).isoformat()
+                db_creature.class_id = class_ids.get(db_creature.creature_type)
+                db_creature.last_modify = datetime.now(timezone.utc)
 
                 session.add(db_creature)
 
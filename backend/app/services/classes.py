@@ -1,73 +1,115 @@
-from sqlmodel import Session, select
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException
+from app import class_registry, response_cache
+from app.db import bind_to_writer, dialect_insert
+from app.services.creatures import link_unclassed_creatures
 from app.models import (
     CreatureClass,
     CreatureClassCreate,
+    CreatureClassRead,
     CreatureClassUpdate,
     Creature,
 )
 
 
-def create_class(session: Session, class_data: CreatureClassCreate) -> CreatureClass:
-    # Ensure class name is unique.
-    existing = session.exec(
-        select(CreatureClass).where(CreatureClass.name == class_data.name)
-    ).first()
-    if existing:
+async def create_class(
+    session: AsyncSession, class_data: CreatureClassCreate
+) -> CreatureClass:
+    # One round-trip; the unique index on name decides, not a pre-SELECT.
+    statement = (
+        dialect_insert(session, CreatureClass)
+        .values(CreatureClass.model_validate(class_data).model_dump(exclude={"id"}))
+        .on_conflict_do_nothing(index_elements=[CreatureClass.name])
+        .returning(CreatureClass)
+    )
+    db_class = (await session.exec(statement)).scalars().first()
+    if db_class is None:
         raise HTTPException(status_code=409, detail="Class already exists")
-
-    db_class = CreatureClass.model_validate(class_data)
-    session.add(db_class)
-    session.commit()
-    session.refresh(db_class)
+    await link_unclassed_creatures(session, [db_class.name])
+    await session.commit()
+    await class_registry.invalidate()
+    await response_cache.bump_generation()
     return db_class
 
 
-def list_classes(session: Session) -> list[CreatureClass]:
-    return session.exec(select(CreatureClass)).all()
+async def list_classes() -> list[CreatureClassRead]:
+    return await class_registry.list_classes()
 
 
-def delete_class(session: Session, class_id: int):
-    class_item = session.get(CreatureClass, class_id)
+async def delete_class(session: AsyncSession, class_id: int):
+    bind_to_writer(session)
+    class_item = await session.get(CreatureClass, class_id)
     if not class_item:
         raise HTTPException(status_code=404, detail="Class not found")
-    session.delete(class_item)
-    session.commit()
-
-
-def update_class(
-    session: Session, class_id: int, class_update: CreatureClassUpdate
+    # ON DELETE SET NULL, spelled out for SQLite (foreign keys not enforced).
+    await session.exec(
+        update(Creature)
+        .where(Creature.class_id == class_id)
+        .values(class_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    await session.delete(class_item)
+    await session.commit()
+    await class_registry.invalidate()
+    await response_cache.bump_generation()
+
+
+async def update_class(
+    session: AsyncSession, class_id: int, class_update: CreatureClassUpdate
 ) -> CreatureClass:
-    db_class = session.get(CreatureClass, class_id)
-    if not db_class:
-        raise HTTPException(status_code=404, detail="Class not found")
-
-    old_name = db_class.name
     update_data = class_update.model_dump(exclude_unset=True)
     update_data = {
         k: v for k, v in update_data.items() if v is not None
     }  # ignore nulls
 
     if not update_data:
-        return db_class  # no-op
+        # No-op.
+        db_class = await session.get(CreatureClass, class_id)
+        if not db_class:
+            raise HTTPException(status_code=404, detail="Class not found")
+        return db_class
 
+    # RETURNING yields the new values only, so a rename needs the old name.
     new_name = update_data.get("name")
-    name_changed = bool(new_name) and new_name != old_name
-
-    for key, value in update_data.items():
-        setattr(db_class, key, value)
-
-    session.add(db_class)
+    old_name = None
+    bind_to_writer(session)
+    if new_name:
+        old_name = (
+            await session.exec(
+                select(CreatureClass.name).where(CreatureClass.id == class_id)
+            )
+        ).first()
+    name_changed = bool(new_name) and old_name is not None and new_name != old_name
+
+    db_class = (
+        (
+            await session.exec(
+                update(CreatureClass)
+                .where(CreatureClass.id == class_id)
+                .values(update_data)
+                .returning(CreatureClass)
+            )
+        )
+        .scalars()
+        .first()
+    )
+    if not db_class:
+        raise HTTPException(status_code=404, detail="Class not found")
 
-    # Propagate name change to associated creatures.
+    # Propagate name change to associated creatures in one set-based UPDATE
+    # (served by the (creature_type, danger_level) index).
     if name_changed:
-        creatures = session.exec(
-            select(Creature).where(Creature.creature_type == old_name)
-        ).all()
-        for c in creatures:
-            c.creature_type = new_name
-            session.add(c)
-
-    session.commit()
-    session.refresh(db_class)
+        await session.exec(
+            update(Creature)
+            .where(Creature.creature_type == old_name)
+            .values(creature_type=new_name)
+            .execution_options(synchronize_session=False)
+        )
+
+    await session.commit()
+    await class_registry.invalidate()
+    # Listings embed class names and colors.
+    await response_cache.bump_generation()
     return db_class
@@ -0,0 +1,317 @@
+import csv
+import io
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterator, Literal, Optional, TextIO
+from arq.connections import ArqRedis
+from pydantic import ValidationError
+from sqlalchemy.dialects import sqlite
+from starlette.concurrency import iterate_in_threadpool
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app import class_registry, response_cache
+from app.db import bind_to_writer
+from app.models import (
+    Creature,
+    CreatureCreate,
+    CreatureFilter,
+    CreatureRead,
+    CreatureTagLink,
+    ImportReject,
+    ImportSummary,
+)
+from app.queue import IMAGE_PROMPT_FIELDS, enqueue_jobs, image_job
+from app.services.creatures import (
+    IN_CLAUSE_CHUNK,
+    apply_filters,
+    chunks,
+    ensure_classes,
+    format_validation_error,
+)
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+ImportFormat = ExportFormat
+
+# Rows fetched per round-trip from the server-side cursor; also the unit in
+# which tag links are looked up and output is flushed.
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_FIELDS = list(CreatureRead.model_fields)
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def _tags_for(session: AsyncSession, names: list[str]) -> dict[str, list[str]]:
+    tags: dict[str, list[str]] = {name: [] for name in names}
+    links = await session.exec(
+        select(CreatureTagLink.creature_name, CreatureTagLink.tag_name)
+        .where(CreatureTagLink.creature_name.in_(names))
+        .order_by(CreatureTagLink.creature_name, CreatureTagLink.tag_name)
+    )
+    for creature_name, tag_name in links:
+        tags[creature_name].append(tag_name)
+    return tags
+
+
+async def export_creatures(
+    session: AsyncSession,
+    fmt: ExportFormat = "ndjson",
+    include_tags: bool = False,
+    filters: Optional[CreatureFilter] = None,
+) -> AsyncIterator[str]:
+    """Yield the registry as NDJSON lines or CSV rows, one batch at a time.
+
+    Rows are read through a server-side cursor (`yield_per`) as plain column
+    tuples rather than ORM objects, so memory stays constant however large
+    the table is.
+    """
+    columns = [getattr(Creature, field) for field in EXPORT_FIELDS]
+    statement = (
+        apply_filters(select(*columns), filters)
+        .order_by(Creature.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    header = EXPORT_FIELDS + (["tags"] if include_tags else [])
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(header)
+
+    result = await session.stream(statement)
+    async for batch in result.partitions():
+        tags = (
+            await _tags_for(session, [row.name for row in batch])
+            if include_tags
+            else {}
+        )
+        for row in batch:
+            record = CreatureRead.model_validate(row._mapping).model_dump(mode="json")
+            if include_tags:
+                record["tags"] = tags[row.name]
+            if fmt == "csv":
+                if include_tags:
+                    record["tags"] = "|".join(record["tags"])
+                writer.writerow([record[field] for field in header])
+            else:
+                buffer.write(json.dumps(record) + "\n")
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+# Records validated and upserted per transaction.
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+# Only the first rejects are echoed back; the count covers all of them.
+MAX_REPORTED_REJECTS = 100
+# Image jobs for imported creatures are deferred so that creatures added
+# interactively in the meantime are drawn first.
+IMPORT_IMAGE_DEFER_MS = int(os.getenv("IMPORT_IMAGE_DEFER_MS", "60000"))
+
+# Columns an import writes; an existing creature keeps its id, image and tags.
+IMPORT_COLUMNS = ("name", "mythology", "creature_type", "danger_level", "habitat")
+
+
+def detect_format(filename: Optional[str]) -> Optional[ImportFormat]:
+    if filename:
+        extension = filename.rsplit(".", 1)[-1].lower()
+        if extension in ("ndjson", "jsonl"):
+            return "ndjson"
+        if extension == "csv":
+            return "csv"
+    return None
+
+
+def _read_records(
+    stream: TextIO, fmt: ImportFormat
+) -> Iterator[tuple[int, Optional[dict], Optional[str]]]:
+    """Yield `(line, payload, error)` for each record, reading lazily."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            # Empty cells fall back to model defaults (e.g. habitat).
+            payload = {k: v for k, v in row.items() if k and v not in ("", None)}
+            if payload.get("danger_level", "").lstrip("-").isdigit():
+                payload["danger_level"] = int(payload["danger_level"])
+            yield reader.line_num, payload, None
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(payload, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, payload, None
+
+
+def _sqlite_upsert():
+    statement = sqlite.insert(Creature)
+    return statement.on_conflict_do_update(
+        index_elements=[Creature.name],
+        set_={
+            column: statement.excluded[column]
+            for column in IMPORT_COLUMNS[1:] + ("class_id", "last_modify")
+        },
+    )
+
+
+async def _copy_upsert(session: AsyncSession, rows: list[dict]) -> None:
+    """Postgres: COPY the batch into a temp table, then upsert from it."""
+    connection = await session.connection()
+    await connection.exec_driver_sql(
+        "CREATE TEMP TABLE IF NOT EXISTS creature_import "
+        "(name text, mythology text, creature_type text, danger_level integer, "
+        "habitat text, class_id integer, last_modify timestamptz) "
+        "ON COMMIT DELETE ROWS"
+    )
+    columns = IMPORT_COLUMNS + ("class_id", "last_modify")
+    raw = await connection.get_raw_connection()
+    async with raw.driver_connection.cursor() as cursor:
+        async with cursor.copy(
+            f"COPY creature_import ({', '.join(columns)}) FROM STDIN"
+        ) as copy:
+            for row in rows:
+                await copy.write_row([row[column] for column in columns])
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns[1:])
+    await connection.exec_driver_sql(
+        f"INSERT INTO creature ({', '.join(columns)}, image_status) "
+        f"SELECT {', '.join(columns)}, 'pending' FROM creature_import "
+        f"ON CONFLICT (name) DO UPDATE SET {updates}"
+    )
+
+
+async def _upsert_batch(session: AsyncSession, items: list[CreatureCreate]) -> list:
+    """Upsert one batch by name in a single transaction; return the new rows
+    (id and the image prompt fields)."""
+    now = datetime.now(timezone.utc)
+    # Last occurrence wins when a name repeats within the batch.
+    rows = {
+        item.name: item.model_dump(include=set(IMPORT_COLUMNS)) | {"last_modify": now}
+        for item in items
+    }
+    names = sorted(rows)
+    bind_to_writer(session)
+    existing = set()
+    for chunk in chunks(names, IN_CLAUSE_CHUNK):
+        existing.update(
+            (
+                await session.exec(
+                    select(Creature.name).where(Creature.name.in_(chunk))
+                )
+            ).all()
+        )
+    new_names = [name for name in names if name not in existing]
+
+    class_ids, new_classes = await ensure_classes(
+        session, {row["creature_type"] for row in rows.values()}
+    )
+    for row in rows.values():
+        row["class_id"] = class_ids[row["creature_type"]]
+    if session.get_bind().dialect.name == "postgresql":
+        await _copy_upsert(session, list(rows.values()))
+    else:
+        await session.exec(
+            _sqlite_upsert(),
+            params=[row | {"image_status": "pending"} for row in rows.values()],
+        )
+
+    prompt_columns = [getattr(Creature, field) for field in IMAGE_PROMPT_FIELDS]
+    created = []
+    for chunk in chunks(new_names, IN_CLAUSE_CHUNK):
+        created.extend(
+            (
+                await session.exec(
+                    select(Creature.id, *prompt_columns).where(Creature.name.in_(chunk))
+                )
+            ).all()
+        )
+    await session.commit()
+    if new_classes:
+        await class_registry.invalidate()
+    return created
+
+
+def _validated_batches(
+    stream: TextIO, fmt: ImportFormat, summary: ImportSummary
+) -> Iterator[list[CreatureCreate]]:
+    """Parse and validate records, recording rejects in `summary` as they occur."""
+    batch: list[CreatureCreate] = []
+    for line, payload, error in _read_records(stream, fmt):
+        summary.processed += 1
+        if payload is not None:
+            try:
+                batch.append(CreatureCreate.model_validate(payload))
+            except ValidationError as e:
+                error = format_validation_error(e)
+        if error is not None:
+            summary.rejected += 1
+            if len(summary.rejects) < MAX_REPORTED_REJECTS:
+                summary.rejects.append(ImportReject(line=line, detail=error))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def import_creatures(
+    session: AsyncSession, stream: TextIO, fmt: ImportFormat
+) -> AsyncIterator[tuple[ImportSummary, list]]:
+    """Validate and upsert creatures from an NDJSON or CSV stream.
+
+    Parsing and validation run in a worker thread and the stream is consumed
+    lazily; each batch of `IMPORT_BATCH_SIZE` records is committed on its own,
+    so memory stays flat and a failure only loses the current batch. Yields
+    the running summary and the creatures created by each batch (id and
+    image prompt fields).
+    """
+    summary = ImportSummary()
+    async for batch in iterate_in_threadpool(_validated_batches(stream, fmt, summary)):
+        created = await _upsert_batch(session, batch)
+        await response_cache.bump_generation()
+        summary.inserted += len(created)
+        summary.updated += len(batch) - len(created)
+        yield summary, created
+    if not summary.inserted and not summary.updated:
+        # Nothing was written (empty file or all rejects); still report.
+        yield summary, []
+
+
+async def enqueue_imported_images(pool, created: list) -> None:
+    await enqueue_jobs(
+        pool,
+        "generate_creature_image",
+        (image_job(row.id, row) for row in created),
+        defer_by_ms=IMPORT_IMAGE_DEFER_MS,
+    )
+
+
+async def import_upload(
+    session: AsyncSession, stream: TextIO, fmt: ImportFormat, pool: Optional[ArqRedis]
+) -> ImportSummary:
+    """Run `import_creatures`, enqueueing image jobs as each batch lands."""
+    summary = ImportSummary()
+    async for summary, created in import_creatures(session, stream, fmt):
+        if not created:
+            continue
+        if pool is None:
+            logger.warning("Job queue unavailable; image generation not enqueued")
+            continue
+        try:
+            await enqueue_imported_images(pool, created)
+        except Exception as e:
+            logger.warning(f"Failed to enqueue image generation: {e}")
+    return summary
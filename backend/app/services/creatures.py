@@ -1,108 +1,696 @@
-from datetime import datetime, timezone
+import base64
+import binascii
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Literal, Optional
+from arq.connections import ArqRedis
 from fastapi import HTTPException
-from sqlmodel import Session, select
-from app.models import Creature, CreatureCreate
+from pydantic import ValidationError
+from sqlalchemy import and_, case, func, insert, or_, text, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app import cache, class_registry, response_cache
+from app.db import bind_to_writer, dialect_insert
+from app.models import (
+    BulkCreateResult,
+    BulkItemResult,
+    Creature,
+    CreatureClass,
+    CreatureClassStyle,
+    CreatureCreate,
+    CreatureFacets,
+    CreatureFilter,
+    CreatureListItem,
+    CreatureRead,
+    CreatureStats,
+    FacetValue,
+)
+from app.queue import (
+    IMAGE_PROMPT_FIELDS,
+    cancel_image_job,
+    enqueue_jobs,
+    image_job,
+    replace_image_job,
+)
 
+logger = logging.getLogger(__name__)
 
-async def create_creature(session: Session, creature: CreatureCreate) -> Creature:
+# Keyset pagination bounds for the list endpoint.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+CreatureSort = Literal["id", "-last_modify"]
+
+# The FTS5 trigram tokenizer cannot match queries shorter than one trigram.
+MIN_TRIGRAM_QUERY = 3
+
+CRITICAL_DANGER_LEVEL = 9
+# Stats are cached until the next write, but the time windows still roll.
+STATS_CACHE_SECONDS = float(os.getenv("STATS_CACHE_SECONDS", "60"))
+
+FACET_FIELDS = ("creature_type", "mythology", "habitat")
+
+# Edits to the image prompt fields within this window share one regeneration.
+IMAGE_REGEN_DEBOUNCE_SECONDS = float(os.getenv("IMAGE_REGEN_DEBOUNCE_SECONDS", "10"))
+# image_error of an edited creature whose regeneration could not be queued.
+IMAGE_QUEUE_DOWN = "Image queue unavailable; regeneration not queued"
+
+# Bulk create limits; IN lists are chunked to stay under driver parameter caps.
+MAX_BULK_ITEMS = int(os.getenv("MAX_BULK_ITEMS", "5000"))
+IN_CLAUSE_CHUNK = 500
+
+
+async def create_creature(
+    session: AsyncSession, creature: CreatureCreate, pool: Optional[ArqRedis] = None
+) -> Creature:
     # Initialize image generation status.
     creature.image_status = "pending"
     creature.image_url = None  # Populated by background worker.
 
     # Set timestamps.
-    creature.last_modify = datetime.now(timezone.utc).isoformat()
+    creature.last_modify = datetime.now(timezone.utc)
 
-    # Automatically register new creature class if missing.
-    from app.models import CreatureClass
+    # Automatically register new creature class if missing (the registry
+    # answers without a query; the insert is skipped for known classes).
+    bind_to_writer(session)
+    new_class = await _register_class(session, creature.creature_type)
 
-    existing_class = session.exec(
-        select(CreatureClass).where(CreatureClass.name == creature.creature_type)
-    ).first()
-    if not existing_class:
-        new_class = CreatureClass(
-            name=creature.creature_type,
-            color="rgba(127,19,236,0.1)",
-            border_color="rgba(127,19,236,0.2)",
-            text_color="#ad92c9",
+    # INSERT ... RETURNING: the row comes back without a refresh SELECT.
+    db_creature = (
+        (
+            await session.exec(
+                dialect_insert(session, Creature)
+                .values(
+                    Creature.model_validate(creature).model_dump(exclude={"id"})
+                    | {"class_id": _class_id_of(creature.creature_type)}
+                )
+                .on_conflict_do_nothing(index_elements=[Creature.name])
+                .returning(Creature)
+            )
         )
-        session.add(new_class)
-
-    db_creature = Creature.model_validate(creature)
-    session.add(db_creature)
-    session.commit()
-    session.refresh(db_creature)
+        .scalars()
+        .first()
+    )
+    if db_creature is None:
+        raise HTTPException(status_code=409, detail="Creature already exists")
+    await session.commit()
+    await response_cache.bump_generation()
+    if new_class:
+        await class_registry.invalidate()
 
     # Queue image generation job.
+    if pool is None:
+        logger.warning("Job queue unavailable; image generation not enqueued")
+        return db_creature
     try:
-        from arq import create_pool
-        from arq.connections import RedisSettings
-        import os
-
-        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        # Parse Redis connection settings.
-        from urllib.parse import urlparse
-
-        p = urlparse(redis_url)
-        settings = RedisSettings(
-            host=p.hostname or "localhost",
-            port=p.port or 6379,
-            password=p.password,
-            database=0,
-        )
-
         # Get Request ID from Context
         from app.app import request_id_context
 
         req_id = request_id_context.get()
 
-        pool = await create_pool(settings)
-        await pool.enqueue_job(
-            "generate_creature_image", db_creature.id, request_id=req_id
-        )
-        await pool.close()
+        await replace_image_job(pool, db_creature, req_id)
     except Exception as e:
-        print(f"Failed to enqueue image generation: {e}")
+        logger.warning(f"Failed to enqueue image generation: {e}")
         # Log failure without interrupting request.
 
     return db_creature
 
 
-def list_creatures(session: Session) -> list[Creature]:
-    creatures = session.exec(select(Creature)).all()
-    return creatures
+def chunks(items: list, size: int):
+    """Split `items` into lists of at most `size` (e.g. IN_CLAUSE_CHUNK)."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+async def link_unclassed_creatures(
+    session: AsyncSession, class_names: Iterable[str]
+) -> None:
+    """Point creatures of these types that have no class (e.g. theirs was
+    deleted and re-created) at the class of that name."""
+    for chunk in chunks(sorted(class_names), IN_CLAUSE_CHUNK):
+        await session.exec(
+            update(Creature)
+            .where(Creature.creature_type.in_(chunk), Creature.class_id.is_(None))
+            .values(
+                class_id=select(CreatureClass.id)
+                .where(CreatureClass.name == Creature.creature_type)
+                .scalar_subquery()
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def _register_class(session: AsyncSession, class_name: str) -> bool:
+    """Insert the class unless the registry knows it; return whether it did
+    (the caller then invalidates the registry after committing)."""
+    if await class_registry.get(class_name) is not None:
+        return False
+    await session.exec(
+        dialect_insert(session, CreatureClass)
+        .values(CreatureClass(name=class_name).model_dump(exclude={"id"}))
+        .on_conflict_do_nothing(index_elements=[CreatureClass.name])
+    )
+    await link_unclassed_creatures(session, [class_name])
+    return True
+
+
+def _class_id_of(class_name: str):
+    """Scalar subquery resolving a class name to its id (NULL if unregistered)."""
+    return (
+        select(CreatureClass.id)
+        .where(CreatureClass.name == class_name)
+        .scalar_subquery()
+    )
+
+
+async def ensure_classes(
+    session: AsyncSession, class_names: set[str]
+) -> tuple[dict[str, int], bool]:
+    """Register any class names that do not exist yet, in one SELECT + one INSERT.
+
+    Returns the id of every requested class, and whether any were created (in
+    which case the caller invalidates the class registry after committing).
+    """
+    class_ids: dict[str, int] = {}
+    for chunk in chunks(sorted(class_names), IN_CLAUSE_CHUNK):
+        class_ids.update(
+            (
+                await session.exec(
+                    select(CreatureClass.name, CreatureClass.id).where(
+                        CreatureClass.name.in_(chunk)
+                    )
+                )
+            ).all()
+        )
+    missing = class_names - class_ids.keys()
+    if missing:
+        class_ids.update(
+            (
+                await session.exec(
+                    insert(CreatureClass).returning(
+                        CreatureClass.name, CreatureClass.id
+                    ),
+                    params=[
+                        CreatureClass(name=name).model_dump(exclude={"id"})
+                        for name in sorted(missing)
+                    ],
+                )
+            ).all()
+        )
+        await link_unclassed_creatures(session, missing)
+    return class_ids, bool(missing)
+
+
+async def create_creatures_bulk(
+    session: AsyncSession, payloads: list[dict], pool: Optional[ArqRedis] = None
+) -> BulkCreateResult:
+    """Validate and insert many creatures, reporting a status per item.
+
+    Invalid items and name conflicts are reported and skipped; the valid rest
+    is inserted with one executemany (`INSERT ... ON CONFLICT (name) DO
+    NOTHING RETURNING`, so a name taken concurrently is a conflict too),
+    missing classes are registered in one pass, and all image jobs are
+    enqueued in a single Redis pipeline.
+    """
+    results: list[BulkItemResult] = []
+    accepted: list[tuple[int, CreatureCreate]] = []
+    seen_names: set[str] = set()
+
+    for index, payload in enumerate(payloads):
+        try:
+            item = CreatureCreate.model_validate(payload)
+        except ValidationError as e:
+            results.append(
+                BulkItemResult(
+                    index=index,
+                    status="invalid",
+                    detail=format_validation_error(e),
+                )
+            )
+            continue
+        if item.name in seen_names:
+            results.append(
+                BulkItemResult(
+                    index=index, status="conflict", detail="Duplicate name in request"
+                )
+            )
+            continue
+        seen_names.add(item.name)
+        accepted.append((index, item))
+
+    # Names that already exist are conflicts, like POST /creatures/ would be.
+    bind_to_writer(session)
+    taken = set()
+    for chunk in chunks(sorted(seen_names), IN_CLAUSE_CHUNK):
+        taken.update(
+            (
+                await session.exec(
+                    select(Creature.name).where(Creature.name.in_(chunk))
+                )
+            ).all()
+        )
+    to_insert = []
+    for index, item in accepted:
+        if item.name in taken:
+            results.append(
+                BulkItemResult(
+                    index=index, status="conflict", detail="Creature already exists"
+                )
+            )
+        else:
+            to_insert.append((index, item))
+
+    created: list[tuple[int, CreatureCreate]] = []
+    if to_insert:
+        now = datetime.now(timezone.utc)
+        class_ids, new_classes = await ensure_classes(
+            session, {item.creature_type for _, item in to_insert}
+        )
+        rows = [
+            item.model_dump()
+            | {
+                "image_status": "pending",
+                "image_url": None,
+                "image_error": None,
+                "last_modify": now,
+                "class_id": class_ids[item.creature_type],
+            }
+            for _, item in to_insert
+        ]
+        inserted = dict(
+            (
+                await session.exec(
+                    dialect_insert(session, Creature)
+                    .on_conflict_do_nothing(index_elements=[Creature.name])
+                    .returning(Creature.name, Creature.id),
+                    params=rows,
+                )
+            ).all()
+        )
+        await session.commit()
+        await response_cache.bump_generation()
+        if new_classes:
+            await class_registry.invalidate()
+
+        for index, item in to_insert:
+            if item.name not in inserted:
+                # Created by someone else since the check above.
+                results.append(
+                    BulkItemResult(
+                        index=index, status="conflict", detail="Creature already exists"
+                    )
+                )
+                continue
+            results.append(
+                BulkItemResult(index=index, status="created", id=inserted[item.name])
+            )
+            created.append((inserted[item.name], item))
+
+    if created and pool is None:
+        logger.warning("Job queue unavailable; image generation not enqueued")
+    elif created:
+        try:
+            from app.app import request_id_context
+
+            req_id = request_id_context.get()
+            await enqueue_jobs(
+                pool,
+                "generate_creature_image",
+                (image_job(creature_id, item, req_id) for creature_id, item in created),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to enqueue image generation: {e}")
+
+    results.sort(key=lambda r: r.index)
+    return BulkCreateResult(
+        created=len(created),
+        failed=len(results) - len(created),
+        items=results,
+    )
+
+
+def encode_cursor(position: dict) -> str:
+    """Serialize a keyset position into an opaque, URL-safe cursor."""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(position, dict) or not isinstance(position.get("id"), int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if position.get("sort", "id") == "-last_modify":
+        try:
+            lm = position.get("lm")
+            position["lm"] = datetime.fromisoformat(lm) if lm is not None else None
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return position
+
+
+def apply_filters(statement, filters: Optional[CreatureFilter]):
+    """Translate a `CreatureFilter` into WHERE clauses on `statement`."""
+    if filters is None:
+        return statement
+    if filters.q:
+        statement = statement.where(Creature.name.icontains(filters.q, autoescape=True))
+    if filters.creature_type:
+        statement = statement.where(Creature.creature_type.in_(filters.creature_type))
+    if filters.mythology:
+        statement = statement.where(Creature.mythology.in_(filters.mythology))
+    if filters.habitat:
+        statement = statement.where(Creature.habitat.in_(filters.habitat))
+    if filters.min_danger is not None:
+        statement = statement.where(Creature.danger_level >= filters.min_danger)
+    if filters.max_danger is not None:
+        statement = statement.where(Creature.danger_level <= filters.max_danger)
+    if filters.modified_since is not None:
+        statement = statement.where(Creature.last_modify >= filters.modified_since)
+    return statement
+
+
+def _after_position(sort: CreatureSort, position: dict):
+    """WHERE clause selecting the rows that follow `position` in `sort` order."""
+    if sort == "id":
+        return Creature.id > position["id"]
 
+    # Most recent first; creatures without a timestamp come last.
+    last_modify = position["lm"]
+    if last_modify is None:
+        return and_(Creature.last_modify.is_(None), Creature.id < position["id"])
+    return or_(
+        Creature.last_modify < last_modify,
+        and_(Creature.last_modify == last_modify, Creature.id < position["id"]),
+        Creature.last_modify.is_(None),
+    )
 
-def get_creature(session: Session, creature_id: int) -> Creature:
-    creature = session.get(Creature, creature_id)
+
+def _position_of(sort: CreatureSort, creature: CreatureRead) -> dict:
+    if sort == "id":
+        return {"id": creature.id}
+    lm = creature.last_modify.isoformat() if creature.last_modify else None
+    return {"sort": sort, "id": creature.id, "lm": lm}
+
+
+async def list_creatures(
+    session: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    filters: Optional[CreatureFilter] = None,
+    sort: CreatureSort = "id",
+) -> tuple[list[CreatureListItem], Optional[str]]:
+    """Return one page of creatures, plus the cursor for the next page.
+
+    Uses keyset pagination (`WHERE id > :last_id ORDER BY id LIMIT n`, or the
+    `(last_modify, id)` equivalent when sorting by recency) so every page is an
+    index range scan, regardless of table size. Each creature carries its
+    class colors, fetched by the same query through an outer join.
+    """
+    statement = apply_filters(
+        select(Creature, CreatureClass).outerjoin(
+            CreatureClass, Creature.class_id == CreatureClass.id
+        ),
+        filters,
+    )
+    if sort == "id":
+        statement = statement.order_by(Creature.id)
+    else:
+        statement = statement.order_by(
+            Creature.last_modify.desc().nulls_last(), Creature.id.desc()
+        )
+
+    if cursor:
+        position = decode_cursor(cursor)
+        if position.get("sort", "id") != sort:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        statement = statement.where(_after_position(sort, position))
+
+    # Fetch one extra row to learn whether another page exists.
+    rows = (await session.exec(statement.limit(limit + 1))).all()
+    creatures = [
+        CreatureListItem.model_validate(
+            creature, update={"creature_class": creature_class}
+        )
+        for creature, creature_class in rows
+    ]
+    if len(creatures) <= limit:
+        return creatures, None
+
+    page = creatures[:limit]
+    return page, encode_cursor(_position_of(sort, page[-1]))
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+async def _compute_stats(session: AsyncSession) -> CreatureStats:
+    now = datetime.now(timezone.utc)
+    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    one_day_ago = now - timedelta(days=1)
+
+    total, critical, this_month, last_24h = (
+        await session.exec(
+            select(
+                func.count(Creature.id),
+                _count_where(Creature.danger_level >= CRITICAL_DANGER_LEVEL),
+                _count_where(Creature.last_modify >= start_of_month),
+                _count_where(Creature.last_modify >= one_day_ago),
+            )
+        )
+    ).one()
+    return CreatureStats(
+        total=total,
+        critical=critical,
+        added_this_month=this_month,
+        added_last_24h=last_24h,
+    )
+
+
+async def get_stats(session: AsyncSession) -> CreatureStats:
+    """Dashboard counters computed with one aggregate query, cached until the next write."""
+    return await cache.get_or_compute(
+        "creature-stats",
+        lambda: _compute_stats(session),
+        max_age=STATS_CACHE_SECONDS,
+    )
+
+
+async def _compute_facets(
+    session: AsyncSession, filters: CreatureFilter
+) -> CreatureFacets:
+    facets = {}
+    for field in FACET_FIELDS:
+        column = getattr(Creature, field)
+        # A facet ignores its own selection so the other values stay selectable.
+        narrowed = filters.model_copy(update={field: []})
+        statement = apply_filters(
+            select(column, func.count()).group_by(column), narrowed
+        ).order_by(column)
+        facets[field] = [
+            FacetValue(value=value, count=count)
+            for value, count in (await session.exec(statement)).all()
+        ]
+    return CreatureFacets(**facets)
+
+
+async def get_facets(session: AsyncSession, filters: CreatureFilter) -> CreatureFacets:
+    """Distinct type/mythology/habitat values with counts under `filters`.
+
+    One `GROUP BY` per facet; cached per filter combination until the next write.
+    """
+    normalized = filters.model_copy(
+        update={field: sorted(set(getattr(filters, field))) for field in FACET_FIELDS}
+    )
+    return await cache.get_or_compute(
+        ("creature-facets", normalized.model_dump_json()),
+        lambda: _compute_facets(session, normalized),
+        # Bounds staleness if a lagging read replica served the computation.
+        max_age=STATS_CACHE_SECONDS,
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def search_creatures(
+    session: AsyncSession, q: str, limit: int
+) -> list[CreatureListItem]:
+    """`_search_creatures` with the class badge colors of each match (from the
+    class registry, so without another query)."""
+    creatures = await _search_creatures(session, q, limit)
+    styles = {c.id: c for c in await class_registry.list_classes()}
+    return [
+        CreatureListItem.model_validate(
+            creature,
+            update={
+                "creature_class": CreatureClassStyle.model_validate(
+                    styles[creature.class_id]
+                )
+                if creature.class_id in styles
+                else None
+            },
+        )
+        for creature in creatures
+    ]
+
+
+async def _search_creatures(
+    session: AsyncSession, q: str, limit: int
+) -> list[Creature]:
+    """Ranked case-insensitive name search backed by the search index.
+
+    SQLite matches against the `creature_fts` trigram table ordered by bm25;
+    Postgres uses `ILIKE` (served by the pg_trgm GIN index) ordered by
+    trigram similarity. Queries too short for trigrams fall back to a
+    substring scan ranked by name length.
+    """
+    dialect = session.get_bind().dialect.name
+
+    if dialect == "sqlite" and len(q) >= MIN_TRIGRAM_QUERY:
+        # Quote as an FTS5 phrase so user input is never parsed as query syntax.
+        phrase = '"' + q.replace('"', '""') + '"'
+        statement = select(Creature).from_statement(
+            text(
+                "SELECT creature.* FROM creature_fts "
+                "JOIN creature ON creature.id = creature_fts.rowid "
+                "WHERE creature_fts MATCH :phrase "
+                "ORDER BY creature_fts.rank, length(creature.name), creature.id "
+                "LIMIT :limit"
+            ).bindparams(phrase=phrase, limit=limit)
+        )
+        return (await session.exec(statement)).scalars().all()
+
+    statement = select(Creature).where(
+        Creature.name.ilike(f"%{_escape_like(q)}%", escape="\\")
+    )
+    if dialect == "postgresql":
+        statement = statement.order_by(func.similarity(Creature.name, q).desc())
+    statement = statement.order_by(func.length(Creature.name), Creature.id)
+    return (await session.exec(statement.limit(limit))).all()
+
+
+async def get_creature(session: AsyncSession, creature_id: int) -> Creature:
+    creature = await session.get(Creature, creature_id)
     if not creature:
         raise HTTPException(status_code=404, detail="Creature not found")
     return creature
 
 
-def update_creature(
-    session: Session, creature_id: int, creature: CreatureCreate
+async def update_creature(
+    session: AsyncSession,
+    creature_id: int,
+    creature: CreatureCreate,
+    pool: Optional[ArqRedis] = None,
 ) -> Creature:
-    db_creature = session.get(Creature, creature_id)
-    if not db_creature:
+    # Only the prompt fields decide whether the image must be regenerated.
+    bind_to_writer(session)
+    previous = (
+        await session.exec(
+            select(*(getattr(Creature, field) for field in IMAGE_PROMPT_FIELDS)).where(
+                Creature.id == creature_id
+            )
+        )
+    ).first()
+    if previous is None:
         raise HTTPException(status_code=404, detail="Creature not found")
 
     creature_data = creature.model_dump(exclude_unset=True)
-    for key, value in creature_data.items():
-        setattr(db_creature, key, value)
-
+    new_class = False
+    if "creature_type" in creature_data:
+        # Like create: an unknown class is registered rather than left unlinked.
+        new_class = await _register_class(session, creature_data["creature_type"])
+    regenerate = any(
+        field in creature_data and creature_data[field] != getattr(previous, field)
+        for field in IMAGE_PROMPT_FIELDS
+    )
+    if "creature_type" in creature_data:
+        creature_data["class_id"] = _class_id_of(creature_data["creature_type"])
+    if regenerate and pool is None:
+        # Nothing would ever pick a "pending" image up; say why it is stale.
+        logger.warning("Job queue unavailable; image regeneration not enqueued")
+        creature_data |= {"image_status": "failed", "image_error": IMAGE_QUEUE_DOWN}
+    elif regenerate:
+        # The current image stays visible until the new one is ready.
+        creature_data |= {"image_status": "pending", "image_error": None}
     # Update timestamp
-    db_creature.last_modify = datetime.now(timezone.utc).isoformat()
+    creature_data["last_modify"] = datetime.now(timezone.utc)
+
+    db_creature = (
+        (
+            await session.exec(
+                update(Creature)
+                .where(Creature.id == creature_id)
+                .values(creature_data)
+                .returning(Creature)
+            )
+        )
+        .scalars()
+        .first()
+    )
+    if not db_creature:
+        raise HTTPException(status_code=404, detail="Creature not found")
+    await session.commit()
+    await response_cache.bump_generation()
+    if new_class:
+        await class_registry.invalidate()
+
+    if not regenerate or pool is None:
+        return db_creature
+    try:
+        from app.app import request_id_context
 
-    session.add(db_creature)
-    session.commit()
-    session.refresh(db_creature)
+        await replace_image_job(
+            pool,
+            db_creature,
+            request_id_context.get(),
+            defer_by_ms=int(IMAGE_REGEN_DEBOUNCE_SECONDS * 1000),
+        )
+    except Exception as e:
+        logger.warning(f"Failed to enqueue image regeneration: {e}")
+        db_creature = (
+            (
+                await session.exec(
+                    update(Creature)
+                    .where(Creature.id == creature_id)
+                    .values(image_status="failed", image_error=IMAGE_QUEUE_DOWN)
+                    .returning(Creature)
+                )
+            )
+            .scalars()
+            .first()
+        ) or db_creature
+        await session.commit()
+        await response_cache.bump_generation()
     return db_creature
 
 
-def delete_creature(session: Session, creature_id: int) -> None:
-    db_creature = session.get(Creature, creature_id)
+async def delete_creature(
+    session: AsyncSession, creature_id: int, pool: Optional[ArqRedis] = None
+) -> None:
+    bind_to_writer(session)
+    db_creature = await session.get(Creature, creature_id)
     if not db_creature:
         raise HTTPException(status_code=404, detail="Creature not found")
 
-    session.delete(db_creature)
-    session.commit()
+    await session.delete(db_creature)
+    await session.commit()
+    await response_cache.bump_generation()
+    if pool is not None:
+        try:
+            await cancel_image_job(pool, creature_id)
+        except Exception as e:
+            logger.warning(f"Failed to cancel image generation: {e}")
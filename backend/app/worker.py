@@ -1,19 +1,45 @@
+import asyncio
 import os
+import re
 from pathlib import Path
 import httpx
 import base64
+from arq import Retry
 from arq.connections import RedisSettings
-from sqlmodel import Session
+from sqlmodel import update
 import app.db as db
+from app import response_cache
 from app.models import Creature
+from app.queue import IMAGE_PROMPT_FIELDS, image_content_hash
+from app.rate_limit import TokenBucket
 from urllib.parse import urlparse
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 BASE_DIR = Path(__file__).resolve().parents[1]  # backend/
 STATIC_DIR = Path(os.getenv("STATIC_DIR", BASE_DIR / "static"))
 CREATURES_DIR = Path(os.getenv("CREATURES_DIR", STATIC_DIR / "creatures"))
+IMAGE_URL_PREFIX = "/static/creatures/"
 
-engine = db.engine
+AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "http://ai-service:8000")
+# One pooled client per worker process; at most this many concurrent requests
+# to ai-service, with idle connections kept open for reuse between jobs.
+AI_MAX_CONNECTIONS = int(os.getenv("AI_MAX_CONNECTIONS", "20"))
+AI_KEEPALIVE_EXPIRY = float(os.getenv("AI_KEEPALIVE_EXPIRY", "60"))
+AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", "5"))
+# Image generation is slow; this bounds one request (read/write/pool wait).
+AI_REQUEST_TIMEOUT = float(os.getenv("AI_REQUEST_TIMEOUT", "30"))
+# Image requests per second across all worker processes (0 = unlimited), and
+# how many may go out back to back after a quiet period.
+AI_RATE_LIMIT = float(os.getenv("AI_RATE_LIMIT", "0"))
+AI_RATE_BURST = int(os.getenv("AI_RATE_BURST", "5"))
+AI_RATE_LIMIT_KEY = "bestiary:ratelimit:generate_image"
+# Delay before retrying a job ai-service answered with 429 and no Retry-After.
+AI_RETRY_DEFER = float(os.getenv("AI_RETRY_DEFER", "10"))
+
+WORKER_MAX_JOBS = int(os.getenv("WORKER_MAX_JOBS", "10"))
+WORKER_JOB_TIMEOUT = int(os.getenv("WORKER_JOB_TIMEOUT", "300"))
+WORKER_MAX_TRIES = int(os.getenv("WORKER_MAX_TRIES", "5"))
+WORKER_KEEP_RESULT = int(os.getenv("WORKER_KEEP_RESULT", "3600"))
 
 parsed = urlparse(REDIS_URL)
 host = parsed.hostname or "localhost"
@@ -27,98 +53,212 @@ except Exception:
     pass
 
 
+def create_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=AI_MAX_CONNECTIONS,
+            max_keepalive_connections=AI_MAX_CONNECTIONS,
+            keepalive_expiry=AI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(AI_REQUEST_TIMEOUT, connect=AI_CONNECT_TIMEOUT),
+    )
+
+
 async def startup(ctx):
     print("Worker starting...")
-    # Verify database engine connection.
+    # Shared by all jobs so connections to ai-service are reused.
+    ctx["http_client"] = create_http_client()
+    # arq sets ctx["redis"] before calling on_startup.
+    if AI_RATE_LIMIT > 0 and ctx.get("redis") is not None:
+        ctx["ai_rate_limit"] = TokenBucket(
+            ctx["redis"], AI_RATE_LIMIT_KEY, AI_RATE_LIMIT, AI_RATE_BURST
+        )
 
 
 async def shutdown(ctx):
     print("Worker shutting down...")
+    if "http_client" in ctx:
+        await ctx["http_client"].aclose()
+
+
+def _retry_after(resp: httpx.Response) -> float:
+    try:
+        return max(float(resp.headers["Retry-After"]), 0)
+    except (KeyError, ValueError):
+        # Missing, or an HTTP date.
+        return AI_RETRY_DEFER
+
+
+async def request_image(
+    client: httpx.AsyncClient,
+    prompt: str,
+    request_id: str | None = None,
+    rate_limit: TokenBucket | None = None,
+) -> dict:
+    if rate_limit is not None:
+        await rate_limit.acquire()
+    headers = {}
+    if request_id:
+        headers["X-Request-ID"] = request_id
+    # Use v1 endpoint as per requirements.
+    resp = await client.post(
+        f"{AI_SERVICE_URL}/v1/generate_image",
+        json={"prompt": prompt},
+        headers=headers,
+        timeout=httpx.Timeout(AI_REQUEST_TIMEOUT, connect=AI_CONNECT_TIMEOUT),
+    )
+    if resp.status_code == 429:
+        # Over quota: try the job again later instead of failing it.
+        raise Retry(defer=_retry_after(resp))
+    resp.raise_for_status()
+    return resp.json()
+
+
+def save_image(image_b64: str, filename: str) -> Path:
+    """Decode and write an image; blocking, so jobs run it in a thread."""
+    CREATURES_DIR.mkdir(parents=True, exist_ok=True)
+    file_path = CREATURES_DIR / filename
+    with open(file_path, "wb") as f:
+        f.write(base64.b64decode(image_b64))
+    return file_path
+
+
+def remove_image(creature_id: int, image_url: str) -> None:
+    """Delete an image this worker generated for `creature_id`.
+
+    `image_url` is client-writable and may be external, legacy or another
+    creature's: anything but `/static/creatures/{creature_id}-<hash>.png` is
+    left alone.
+    """
+    if not image_url.startswith(IMAGE_URL_PREFIX):
+        return
+    filename = image_url.removeprefix(IMAGE_URL_PREFIX)
+    if re.fullmatch(rf"{creature_id}-[0-9a-f]{{16}}\.png", filename):
+        (CREATURES_DIR / filename).unlink(missing_ok=True)
 
 
-async def generate_creature_image(ctx, creature_id: int, request_id: str | None = None):
+async def set_image_status(creature: Creature, **values) -> bool:
+    """Update the image columns unless the prompt fields changed since
+    `creature` was loaded (the job is then stale); return whether it did."""
+    async with db.new_session() as session:
+        result = await session.exec(
+            update(Creature)
+            .where(
+                Creature.id == creature.id,
+                *(
+                    getattr(Creature, field) == getattr(creature, field)
+                    for field in IMAGE_PROMPT_FIELDS
+                ),
+            )
+            .values(**values)
+        )
+        await session.commit()
+    return result.rowcount > 0
+
+
+async def generate_creature_image(
+    ctx,
+    creature_id: int,
+    request_id: str | None = None,
+    content_hash: str | None = None,
+):
     print(f"Generating image for creature {creature_id} (ReqID: {request_id})")
-    with Session(engine) as session:
-        creature = session.get(Creature, creature_id)
-        if not creature:
-            print(f"Creature {creature_id} not found.")
+    # Async DB access and short sessions: jobs only share the event loop, and
+    # no connection is held while waiting on ai-service.
+    async with db.new_session() as session:
+        creature = await session.get(Creature, creature_id)
+    if not creature:
+        print(f"Creature {creature_id} not found.")
+        return
+
+    # Jobs are enqueued with the content hash they were meant for; an edit
+    # since then enqueued a job for the new content.
+    current_hash = image_content_hash(creature)
+    if content_hash is not None and content_hash != current_hash:
+        print(f"Creature {creature_id} changed since this job was queued. Skipping.")
+        return
+
+    # One file per content version, so a superseded job never overwrites the
+    # image of a newer one.
+    filename = f"{creature_id}-{current_hash}.png"
+    image_url = f"{IMAGE_URL_PREFIX}{filename}"
+
+    # Idempotency check
+    if creature.image_status == "ready" and creature.image_url == image_url:
+        # Check for existing image file.
+        if await asyncio.to_thread(os.path.exists, CREATURES_DIR / filename):
+            print(f"Creature {creature_id} already has image. Skipping.")
             return
 
-        # Idempotency check
-        if creature.image_status == "ready" and creature.image_url:
-            # Check for existing image file.
-            if os.path.exists(f"/app{creature.image_url}"):
-                print(f"Creature {creature_id} already has image. Skipping.")
-                return
+    # Construct visual tokens for the image generation prompt.
+    visual_tokens = f"{creature.creature_type} {creature.mythology} {creature.habitat}"
+
+    prompt = (
+        f"High-end fantasy creature concept art, bright neutral studio background with soft gradient, no vignette, "
+        f"centered composition, clean silhouette, ultra-detailed textures, soft key light and gentle fill light, "
+        f"balanced exposure, lifted shadows, soft glow accents, sharp focus, shallow depth of field, "
+        f"clean color grading, vibrant but natural colors, 4k digital painting, "
+        f"no text, no watermark, no logo. "
+        f"Creature: {creature.name}. Class: {creature.creature_type}. "
+        f"Mythology: {creature.mythology}. Habitat: {creature.habitat}. "
+        f"Visual design cues: {visual_tokens}. "
+        f"Full body (or portrait if specified), 3/4 view, subject fills ~70% of frame, minimal background, "
+        f"a few floating particles/sparks, strong readable shapes, consistent style. "
+        f"Negative: No text, no captions, no UI, no frame, no border, no extra characters, no gore, no nudity, "
+        f"no photorealistic camera look, no low-res, no blurry, no distorted anatomy, no duplicate heads/limbs, "
+        f"no underexposure, no heavy shadows, no dark scene."
+    )
 
-        ai_url = os.getenv("AI_SERVICE_URL", "http://ai-service:8000")
+    print(f"Prompt Length: {len(prompt)}", flush=True)
+    print(f"Prompt Start: {prompt[:300]}", flush=True)
 
-        # Construct visual tokens for the image generation prompt.
-        visual_tokens = (
-            f"{creature.creature_type} {creature.mythology} {creature.habitat}"
-        )
+    try:
+        client = ctx.get("http_client")
+        rate_limit = ctx.get("ai_rate_limit")
+        if client is not None:
+            data = await request_image(client, prompt, request_id, rate_limit)
+        else:
+            # Called outside a worker (no startup hook): one-off client.
+            async with create_http_client() as client:
+                data = await request_image(client, prompt, request_id, rate_limit)
 
-        prompt = (
-            f"High-end fantasy creature concept art, bright neutral studio background with soft gradient, no vignette, "
-            f"centered composition, clean silhouette, ultra-detailed textures, soft key light and gentle fill light, "
-            f"balanced exposure, lifted shadows, soft glow accents, sharp focus, shallow depth of field, "
-            f"clean color grading, vibrant but natural colors, 4k digital painting, "
-            f"no text, no watermark, no logo. "
-            f"Creature: {creature.name}. Class: {creature.creature_type}. "
-            f"Mythology: {creature.mythology}. Habitat: {creature.habitat}. "
-            f"Visual design cues: {visual_tokens}. "
-            f"Full body (or portrait if specified), 3/4 view, subject fills ~70% of frame, minimal background, "
-            f"a few floating particles/sparks, strong readable shapes, consistent style. "
-            f"Negative: No text, no captions, no UI, no frame, no border, no extra characters, no gore, no nudity, "
-            f"no photorealistic camera look, no low-res, no blurry, no distorted anatomy, no duplicate heads/limbs, "
-            f"no underexposure, no heavy shadows, no dark scene."
-        )
+        image_b64 = data.get("image_base64")
+        if not image_b64:
+            raise ValueError("No image_base64 in response")
+
+        # Save file
+        await asyncio.to_thread(save_image, image_b64, filename)
+
+        # Update DB
+        if not await set_image_status(
+            creature, image_url=image_url, image_status="ready", image_error=None
+        ):
+            print(f"Creature {creature_id} changed during generation. Discarding.")
+            await asyncio.to_thread(remove_image, creature_id, image_url)
+            return
+        if creature.image_url and creature.image_url != image_url:
+            # The image of the previous content version.
+            await asyncio.to_thread(remove_image, creature_id, creature.image_url)
+        # Listings show the image; stats and facets are unaffected.
+        await response_cache.bump_image_generation(ctx.get("redis"))
+        print(f"Image generated for {creature_id} at {image_url}")
+
+    except Retry as e:
+        if ctx.get("job_try", 1) < WORKER_MAX_TRIES:
+            print(f"ai-service busy for {creature_id}; retrying in {e.defer_score} ms")
+            raise
+        print(f"ai-service still busy for {creature_id}; giving up")
+        if await set_image_status(
+            creature, image_status="failed", image_error="ai-service rate limited"
+        ):
+            await response_cache.bump_image_generation(ctx.get("redis"))
+        raise RuntimeError("ai-service rate limited") from e
 
-        print(f"Prompt Length: {len(prompt)}", flush=True)
-        print(f"Prompt Start: {prompt[:300]}", flush=True)
-
-        headers = {}
-        if request_id:
-            headers["X-Request-ID"] = request_id
-
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Use v1 endpoint as per requirements.
-                resp = await client.post(
-                    f"{ai_url}/v1/generate_image",
-                    json={"prompt": prompt},
-                    headers=headers,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-
-            image_b64 = data.get("image_base64")
-            if not image_b64:
-                raise ValueError("No image_base64 in response")
-
-            # Save file
-            CREATURES_DIR.mkdir(parents=True, exist_ok=True)
-            filename = f"{creature_id}.png"
-            file_path = CREATURES_DIR / filename
-
-            with open(file_path, "wb") as f:
-                f.write(base64.b64decode(image_b64))
-
-            # Update DB
-            creature.image_url = f"/static/creatures/{filename}"
-            creature.image_status = "ready"
-            creature.image_error = None
-            session.add(creature)
-            session.commit()
-            print(f"Image generated for {creature_id} at {creature.image_url}")
-
-        except Exception as e:
-            print(f"Failed to generate image for {creature_id}: {e}")
-            creature.image_status = "failed"
-            creature.image_error = str(e)
-            session.add(creature)
-            session.commit()
-            raise e  # Trigger retry mechanism
+    except Exception as e:
+        print(f"Failed to generate image for {creature_id}: {e}")
+        if await set_image_status(creature, image_status="failed", image_error=str(e)):
+            await response_cache.bump_image_generation(ctx.get("redis"))
+        raise e  # Trigger retry mechanism
 
 
 class WorkerSettings:
@@ -128,3 +268,7 @@ class WorkerSettings:
     )
     on_startup = startup
     on_shutdown = shutdown
+    max_jobs = WORKER_MAX_JOBS
+    job_timeout = WORKER_JOB_TIMEOUT
+    max_tries = WORKER_MAX_TRIES
+    keep_result = WORKER_KEEP_RESULT
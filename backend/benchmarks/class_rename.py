@@ -0,0 +1,105 @@
+"""Renaming a class with many creatures: per-row ORM updates vs one set-based UPDATE.
+
+Runs against a throwaway SQLite file (or `--url` for another database; the
+tables must not exist there yet, they are created and dropped).
+
+    uv run python -m benchmarks.class_rename --rows 100000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from sqlalchemy import func, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db import to_async_url
+from app.models import Creature, CreatureClass, CreatureClassUpdate
+from app.services import classes as service
+
+BATCH = 5000
+
+
+async def seed(engine, rows: int) -> int:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        db_class = CreatureClass(name="Popular")
+        session.add(db_class)
+        await session.commit()
+        for start in range(0, rows, BATCH):
+            await session.exec(
+                insert(Creature),
+                params=[
+                    {
+                        "name": f"creature-{i}",
+                        "mythology": "Bench",
+                        "creature_type": "Popular",
+                        "danger_level": i % 10 + 1,
+                        "habitat": "Unknown",
+                        "image_status": "completed",
+                    }
+                    for i in range(start, min(start + BATCH, rows))
+                ],
+            )
+        await session.commit()
+        return db_class.id
+
+
+async def per_row_rename(engine, class_id: int, old: str, new: str) -> None:
+    """What update_class used to do: load every creature and mutate it."""
+    async with AsyncSession(engine) as session:
+        db_class = await session.get(CreatureClass, class_id)
+        db_class.name = new
+        creatures = (
+            await session.exec(select(Creature).where(Creature.creature_type == old))
+        ).all()
+        for creature in creatures:
+            creature.creature_type = new
+            session.add(creature)
+        await session.commit()
+
+
+async def set_based_rename(engine, class_id: int, old: str, new: str) -> None:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await service.update_class(session, class_id, CreatureClassUpdate(name=new))
+
+
+async def main(url: str, rows: int) -> None:
+    engine = create_async_engine(to_async_url(url))
+    try:
+        class_id = await seed(engine, rows)
+        print(f"renaming a class with {rows} creatures on {engine.url.drivername}")
+        name = "Popular"
+        for label, rename in (
+            ("per-row ORM updates", per_row_rename),
+            ("set-based UPDATE", set_based_rename),
+        ):
+            start = time.perf_counter()
+            await rename(engine, class_id, name, name + "!")
+            elapsed = time.perf_counter() - start
+            name += "!"
+            async with AsyncSession(engine) as session:
+                renamed = (
+                    await session.exec(
+                        select(func.count()).where(Creature.creature_type == name)
+                    )
+                ).one()
+            assert renamed == rows, renamed
+            print(f"{label:<22} {elapsed * 1000:9.1f} ms")
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--url", help="Database URL (default: a temporary SQLite file)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(main(url, args.rows))
@@ -0,0 +1,66 @@
+"""Latency of the enqueue step of POST /creatures/: pool per request vs shared pool.
+
+Needs a reachable Redis (`REDIS_URL`). Jobs go to a throwaway queue so no
+worker picks them up; the queue is deleted afterwards.
+
+    uv run python -m benchmarks.enqueue_pool --requests 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from arq import create_pool
+from arq.connections import RedisSettings
+from app.queue import REDIS_URL
+
+QUEUE = "bench:enqueue-pool"
+
+
+def report(label: str, samples: list[float]) -> None:
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    print(
+        f"{label:<22} mean {statistics.mean(samples_ms):7.2f} ms   "
+        f"p50 {statistics.median(samples_ms):7.2f} ms   p95 {p95:7.2f} ms"
+    )
+
+
+async def per_request_pool(settings: RedisSettings, n: int) -> list[float]:
+    """What create_creature used to do: connect, enqueue, close."""
+    samples = []
+    for i in range(n):
+        start = time.perf_counter()
+        pool = await create_pool(settings, default_queue_name=QUEUE)
+        await pool.enqueue_job("generate_creature_image", i)
+        await pool.aclose()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def shared_pool(settings: RedisSettings, n: int) -> list[float]:
+    """Current behaviour: one pool opened in the lifespan and reused."""
+    pool = await create_pool(settings, default_queue_name=QUEUE)
+    samples = []
+    try:
+        for i in range(n):
+            start = time.perf_counter()
+            await pool.enqueue_job("generate_creature_image", i)
+            samples.append(time.perf_counter() - start)
+        await pool.delete(QUEUE)
+    finally:
+        await pool.aclose()
+    return samples
+
+
+async def main(n: int) -> None:
+    settings = RedisSettings.from_dsn(REDIS_URL)
+    print(f"{n} enqueues against {settings.host}:{settings.port}/{settings.database}")
+    report("pool per request", await per_request_pool(settings, n))
+    report("shared pool", await shared_pool(settings, n))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,122 @@
+"""Image-job throughput of the worker as `max_jobs` grows.
+
+Runs `generate_creature_image` for `--jobs` creatures with at most `max_jobs`
+in flight (what arq's `max_jobs` allows), against a throwaway SQLite file (or
+`--url`; the tables must not exist there yet) and a stub ai-service that
+answers after `--latency` ms with a `--image-kib` image.
+
+    uv run python -m benchmarks.worker_concurrency --jobs 200 --latency 50
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+import httpx
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app import db, worker
+from app.db import to_async_url
+from app.models import Creature
+
+MAX_JOBS = (1, 2, 5, 10, 20)
+
+
+def stub_ai_service(latency: float, image_kib: int) -> httpx.AsyncClient:
+    image = base64.b64encode(os.urandom(image_kib * 1024)).decode()
+    body = json.dumps({"image_base64": image}).encode()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(
+            200, content=body, headers={"Content-Type": "application/json"}
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def seed(engine, jobs: int) -> list[int]:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        ids = (
+            await session.exec(
+                insert(Creature).returning(Creature.id),
+                params=[
+                    {
+                        "name": f"creature-{i}",
+                        "mythology": "Bench",
+                        "creature_type": "Bench",
+                        "danger_level": i % 10 + 1,
+                        "habitat": "Unknown",
+                        "image_status": "pending",
+                    }
+                    for i in range(jobs)
+                ],
+            )
+        ).scalars()
+        ids = list(ids)
+        await session.commit()
+        return ids
+
+
+async def run_jobs(ctx: dict, ids: list[int], max_jobs: int) -> float:
+    semaphore = asyncio.Semaphore(max_jobs)
+
+    async def job(creature_id: int) -> None:
+        async with semaphore:
+            await worker.generate_creature_image(ctx, creature_id)
+
+    start = time.perf_counter()
+    # The job prints its prompt; keep the report readable.
+    with contextlib.redirect_stdout(io.StringIO()):
+        await asyncio.gather(*(job(creature_id) for creature_id in ids))
+    return len(ids) / (time.perf_counter() - start)
+
+
+async def main(url: str, jobs: int, latency: float, image_kib: int) -> None:
+    engine = create_async_engine(to_async_url(url))
+    if db._is_file_sqlite(url):
+        db._apply_sqlite_pragmas(engine.sync_engine)  # WAL, as in production
+    db.async_engine, db.async_writer_engine = engine, None
+    ctx = {"http_client": stub_ai_service(latency, image_kib)}
+    try:
+        ids = await seed(engine, jobs)
+        print(
+            f"{jobs} jobs, ai-service {latency * 1000:.0f} ms / {image_kib} KiB, "
+            f"on {engine.url.drivername}"
+        )
+        for max_jobs in MAX_JOBS:
+            # Otherwise the idempotency check skips the creatures done last round.
+            async with engine.begin() as conn:
+                await conn.execute(
+                    update(Creature).values(image_status="pending", image_url=None)
+                )
+            rate = await run_jobs(ctx, ids, max_jobs)
+            print(f"max_jobs={max_jobs:<3} {rate:8.1f} jobs/s")
+    finally:
+        await ctx["http_client"].aclose()
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=50, help="ms")
+    parser.add_argument("--image-kib", type=int, default=1024)
+    parser.add_argument("--url", help="Database URL (default: a temporary SQLite file)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        worker.CREATURES_DIR = Path(tmp) / "creatures"
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(main(url, args.jobs, args.latency / 1000, args.image_kib))
@@ -0,0 +1,86 @@
+"""Image jobs per second against the mock ai-service: client per job vs shared client.
+
+Only the HTTP step of `generate_creature_image` is measured. By default the
+mock ai-service (`ai-service/main.py` with MOCK_MODE=1) is started in-process
+on a free port; pass `--url` to target a running one instead.
+
+    uv run python -m benchmarks.worker_http_client --jobs 2000 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+import httpx
+import uvicorn
+from app import worker
+
+AI_SERVICE_DIR = Path(__file__).resolve().parents[2] / "ai-service"
+PROMPT = "High-end fantasy creature concept art. " * 40
+
+
+def start_mock_ai_service() -> str:
+    os.environ["MOCK_MODE"] = "1"
+    spec = importlib.util.spec_from_file_location(
+        "mock_ai_service", AI_SERVICE_DIR / "main.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(module.app, port=port, log_level="warning", access_log=False)
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_jobs(jobs: int, concurrency: int, shared: bool) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    client = worker.create_http_client() if shared else None
+
+    async def job() -> None:
+        async with semaphore:
+            if client is not None:
+                await worker.request_image(client, PROMPT)
+            else:
+                # What every job used to do.
+                async with worker.create_http_client() as own_client:
+                    await worker.request_image(own_client, PROMPT)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(job() for _ in range(jobs)))
+    finally:
+        if client is not None:
+            await client.aclose()
+    return jobs / (time.perf_counter() - start)
+
+
+async def main(jobs: int, concurrency: int) -> None:
+    print(f"{jobs} jobs, {concurrency} concurrent, against {worker.AI_SERVICE_URL}")
+    for label, shared in (("client per job", False), ("shared client", True)):
+        await run_jobs(min(jobs, 50), concurrency, shared)  # warm-up
+        rate = await run_jobs(jobs, concurrency, shared)
+        print(f"{label:<16} {rate:8.1f} jobs/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--url", help="A running ai-service in MOCK_MODE")
+    args = parser.parse_args()
+    worker.AI_SERVICE_URL = args.url or start_mock_ai_service()
+    try:
+        asyncio.run(main(args.jobs, args.concurrency))
+    except httpx.HTTPError as e:
+        raise SystemExit(f"ai-service request failed: {e!r}")
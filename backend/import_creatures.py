@@ -0,0 +1,64 @@
+"""Import creatures from an NDJSON or CSV file (e.g. a GET /creatures/export dump).
+
+uv run python import_creatures.py bestiary.ndjson
+uv run python import_creatures.py bestiary.csv --no-images
+"""
+
+import argparse
+import asyncio
+import sys
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db import async_engine
+from app.services import creature_io
+from app.queue import create_arq_pool
+
+
+async def run_import(path: str, fmt: str, enqueue_images: bool) -> int:
+    pool = await create_arq_pool() if enqueue_images else None
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            async with AsyncSession(async_engine) as session:
+                summary = None
+                async for summary, created in creature_io.import_creatures(
+                    session, stream, fmt
+                ):
+                    if pool is not None and created:
+                        await creature_io.enqueue_imported_images(pool, created)
+                    print(
+                        f"{summary.processed} processed: {summary.inserted} inserted, "
+                        f"{summary.updated} updated, {summary.rejected} rejected"
+                    )
+    finally:
+        if pool is not None:
+            await pool.aclose()
+        await async_engine.dispose()
+
+    for reject in summary.rejects:
+        print(f"  line {reject.line}: {reject.detail}", file=sys.stderr)
+    if summary.rejected > len(summary.rejects):
+        print(
+            f"  ... and {summary.rejected - len(summary.rejects)} more",
+            file=sys.stderr,
+        )
+    return 1 if summary.rejected else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["ndjson", "csv"])
+    parser.add_argument(
+        "--no-images",
+        action="store_true",
+        help="Do not enqueue image generation for new creatures",
+    )
+    args = parser.parse_args()
+
+    fmt = args.format or creature_io.detect_format(args.path)
+    if fmt is None:
+        parser.error("cannot infer the format from the file name; pass --format")
+    return asyncio.run(run_import(args.path, fmt, not args.no_images))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,9 @@
 import pytest
 import os
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session, SQLModel, create_engine
-from sqlmodel.pool import StaticPool
 from fastapi.testclient import TestClient
 
 # Ensure models are registered for metadata creation.
@@ -13,20 +14,20 @@ os.environ.setdefault("DATABASE_URL", "sqlite://")
 
 # Import app modules after environment configuration.
 from app.app import app
-from app.db import get_session
+from app.queue import get_arq_pool
+from app import cache, class_registry
 
 
 @pytest.fixture(name="engine")
-def engine_fixture():
+def engine_fixture(tmp_path):
     """
-    Create a shared in-memory SQLite engine.
-    Use StaticPool so all connections are the same (sharing state between test and app).
+    Create a throwaway SQLite database file per test.
+    A file (rather than :memory:) lets the sync engine used by fixtures share
+    state with the async engine used by request handlers and the worker.
     """
-    # Use in-memory SQLite for isolation and speed.
     engine = create_engine(
-        "sqlite://",
+        f"sqlite:///{tmp_path / 'test.db'}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
 
     SQLModel.metadata.create_all(engine)
@@ -35,8 +36,17 @@ def engine_fixture():
     engine.dispose()
 
 
+@pytest.fixture(name="async_engine")
+def async_engine_fixture(engine):
+    # TestClient runs each request on a fresh event loop, so async connections
+    # must not be pooled across requests.
+    return create_async_engine(
+        f"sqlite+aiosqlite:///{engine.url.database}", poolclass=NullPool
+    )
+
+
 @pytest.fixture(autouse=True)
-def patch_engines(engine):
+def patch_engines(engine, async_engine):
     """
     Patch app engines ONLY when using sqlite.
     If DATABASE_URL points to Postgres, do not patch so tests can hit the real DB.
@@ -46,7 +56,10 @@ def patch_engines(engine):
         yield
         return
 
-    with patch("app.db.engine", engine), patch("app.worker.engine", engine):
+    with (
+        patch("app.db.engine", engine),
+        patch("app.db.async_engine", async_engine),
+    ):
         yield
 
 
@@ -58,12 +71,112 @@ def mock_redis():
     mock_pool = AsyncMock()
     mock_pool.enqueue_job.return_value = None
     mock_pool.close.return_value = None
+    # No image job tracked yet (app.queue.replace_image_job / cancel_image_job).
+    mock_pool.set.return_value = None
+    mock_pool.getdel.return_value = None
+    # Batched enqueues (app.queue.enqueue_jobs) go through a pipeline.
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    pipe.__aenter__.return_value = pipe
+    mock_pool.pipeline = MagicMock(return_value=pipe)
+    mock_pool.expires_extra_ms = 86_400_000
+    mock_pool.job_serializer = None
+    mock_pool.default_queue_name = "arq:queue"
 
     with patch("arq.create_pool", new_callable=AsyncMock) as mock_create:
         mock_create.return_value = mock_pool
         yield mock_create
 
 
+@pytest.fixture(autouse=True)
+def reset_read_cache():
+    """Cached read models are process-wide; start every test from a cold cache."""
+    cache.clear()
+    class_registry.clear()
+    yield
+
+
+class FakePipeline:
+    """Non-transactional pipeline: commands are buffered until `execute`."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.commands = []
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+        return lambda *args, **kwargs: self.commands.append((command, args, kwargs))
+
+    async def execute(self):
+        commands, self.commands = self.commands, []
+        return [await command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+class FakeRedis:
+    """The few Redis commands the class registry, response cache, rate
+    limiter and job queue use. Lua scripts are not run: they return
+    `script_results` in order, then 0."""
+
+    # ArqRedis defaults read by app.queue.enqueue_jobs.
+    expires_extra_ms = 86_400_000
+    job_serializer = None
+    default_queue_name = "arq:queue"
+
+    def __init__(self):
+        self.data = {}
+        self.sorted_sets = {}
+        self.script_results = []
+        self.script_calls = []
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def zadd(self, key, mapping, nx=False):
+        members = self.sorted_sets.setdefault(key, {})
+        added = [m for m in mapping if m not in members]
+        for member, score in mapping.items():
+            if member in added or not nx:
+                members[member] = score
+        return len(added)
+
+    async def zscore(self, key, member):
+        return self.sorted_sets.get(key, {}).get(member)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def register_script(self, script):
+        async def run(keys=(), args=()):
+            self.script_calls.append((list(keys), list(args)))
+            return self.script_results.pop(0) if self.script_results else 0
+
+        return run
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
 @pytest.fixture(name="session")
 def session_fixture(engine):
     with Session(engine) as session:
@@ -71,10 +184,8 @@ def session_fixture(engine):
 
 
 @pytest.fixture(name="client")
-def client_fixture(session: Session):
-    def get_session_override():
-        return session
-
-    app.dependency_overrides[get_session] = get_session_override
+def client_fixture(mock_redis):
+    # The lifespan (which opens the real pool) does not run for a bare TestClient.
+    app.dependency_overrides[get_arq_pool] = lambda: mock_redis.return_value
     yield TestClient(app)
     app.dependency_overrides.clear()
@@ -4,6 +4,7 @@ from app.models import Creature
 # Integration test using mocked AI service to verify worker flow.
 
 from unittest.mock import patch, MagicMock
+from app.queue import image_content_hash
 from app.worker import generate_creature_image
 
 
@@ -53,3 +54,239 @@ async def test_ai_integration_flow_mocked(session):
             session.refresh(creature)
             assert creature.image_status == "ready"
             assert creature.image_url is not None
+
+
+@pytest.mark.asyncio
+async def test_jobs_share_the_worker_http_client(session):
+    from app.worker import shutdown, startup
+
+    ids = []
+    for name in ("Shared A", "Shared B"):
+        creature = Creature(
+            name=name,
+            creature_type="Test",
+            mythology="Test",
+            habitat="Test",
+            danger_level=1,
+            image_status="pending",
+        )
+        session.add(creature)
+        session.commit()
+        ids.append(creature.id)
+
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"image_base64": "aGk="}
+
+    ctx = {}
+    await startup(ctx)
+    client = ctx["http_client"]
+    with (
+        patch.object(client, "post", return_value=mock_response) as mock_post,
+        patch("builtins.open", new_callable=MagicMock),
+    ):
+        for creature_id in ids:
+            await generate_creature_image(ctx, creature_id)
+    assert mock_post.await_count == 2
+    # Each request carries its own timeout.
+    assert mock_post.call_args.kwargs["timeout"] is not None
+
+    await shutdown(ctx)
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_job_keeps_file_io_off_the_event_loop(session):
+    import threading
+
+    creature = Creature(
+        name="Threaded",
+        creature_type="Test",
+        mythology="Test",
+        habitat="Test",
+        danger_level=1,
+        image_status="pending",
+    )
+    session.add(creature)
+    session.commit()
+
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"image_base64": "aGk="}
+    write_threads = []
+
+    def fake_open(*args, **kwargs):
+        write_threads.append(threading.get_ident())
+        return MagicMock()
+
+    with (
+        patch("httpx.AsyncClient.post", return_value=mock_response),
+        patch("builtins.open", side_effect=fake_open),
+    ):
+        await generate_creature_image({}, creature.id)
+
+    assert write_threads and threading.get_ident() not in write_threads
+    session.refresh(creature)
+    assert creature.image_status == "ready"
+    content_hash = image_content_hash(creature)
+    assert creature.image_url == f"/static/creatures/{creature.id}-{content_hash}.png"
+
+
+@pytest.mark.asyncio
+async def test_ai_service_429_retries_the_job_until_max_tries(session):
+    from arq import Retry
+    from app.worker import WORKER_MAX_TRIES
+
+    creature = Creature(
+        name="Over Quota",
+        creature_type="Test",
+        mythology="Test",
+        habitat="Test",
+        danger_level=1,
+        image_status="pending",
+    )
+    session.add(creature)
+    session.commit()
+
+    busy = MagicMock(status_code=429, headers={"Retry-After": "7"})
+    with patch("httpx.AsyncClient.post", return_value=busy):
+        with pytest.raises(Retry) as retry:
+            await generate_creature_image({"job_try": 1}, creature.id)
+        assert retry.value.defer_score == 7000
+        session.refresh(creature)
+        assert creature.image_status == "pending"
+
+        with pytest.raises(RuntimeError):
+            await generate_creature_image({"job_try": WORKER_MAX_TRIES}, creature.id)
+        session.refresh(creature)
+        assert creature.image_status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_image_requests_wait_for_the_shared_token_bucket(session, fake_redis):
+    from app import worker
+
+    creature = Creature(
+        name="Rate Limited",
+        creature_type="Test",
+        mythology="Test",
+        habitat="Test",
+        danger_level=1,
+        image_status="pending",
+    )
+    session.add(creature)
+    session.commit()
+
+    mock_response = MagicMock(status_code=200)
+    mock_response.json.return_value = {"image_base64": "aGk="}
+    ctx = {"redis": fake_redis}
+    with patch.object(worker, "AI_RATE_LIMIT", 2.0):
+        await worker.startup(ctx)
+    # The bucket is empty: the script says a token is due in 250 ms.
+    fake_redis.script_results = [250]
+    with (
+        patch("app.rate_limit.asyncio.sleep") as sleep,
+        patch.object(ctx["http_client"], "post", return_value=mock_response),
+        patch("builtins.open", new_callable=MagicMock),
+    ):
+        await worker.generate_creature_image(ctx, creature.id)
+    await worker.shutdown(ctx)
+
+    sleep.assert_awaited_once_with(0.25)
+    assert (
+        fake_redis.script_calls
+        == [([worker.AI_RATE_LIMIT_KEY], [2.0, worker.AI_RATE_BURST])] * 2
+    )
+    session.refresh(creature)
+    assert creature.image_status == "ready"
+
+
+@pytest.mark.asyncio
+async def test_stale_image_jobs_are_superseded(session):
+    from app.queue import image_content_hash
+
+    creature = Creature(
+        name="Shifting",
+        creature_type="Test",
+        mythology="Test",
+        habitat="Cave",
+        danger_level=1,
+        image_status="pending",
+    )
+    session.add(creature)
+    session.commit()
+    queued_hash = image_content_hash(creature)
+
+    # Edited after the job was queued: the job does nothing.
+    creature.habitat = "Sea"
+    session.add(creature)
+    session.commit()
+    with patch("httpx.AsyncClient.post") as mock_post:
+        await generate_creature_image({}, creature.id, content_hash=queued_hash)
+    mock_post.assert_not_called()
+
+    # Edited while the image was being generated: the result is discarded.
+    mock_response = MagicMock(status_code=200)
+    mock_response.json.return_value = {"image_base64": "aGk="}
+
+    async def edit_then_respond(*args, **kwargs):
+        creature.habitat = "Sky"
+        session.add(creature)
+        session.commit()
+        return mock_response
+
+    with (
+        patch("httpx.AsyncClient.post", side_effect=edit_then_respond),
+        patch("builtins.open", new_callable=MagicMock),
+        patch("app.worker.remove_image") as remove_image,
+    ):
+        await generate_creature_image(
+            {}, creature.id, content_hash=image_content_hash(creature)
+        )
+    session.refresh(creature)
+    assert creature.image_status == "pending" and creature.image_url is None
+    remove_image.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_only_the_creatures_own_previous_image_is_removed(session, tmp_path):
+    from app import worker
+
+    mock_response = MagicMock(status_code=200)
+    mock_response.json.return_value = {"image_base64": "aGk="}
+    foreign = tmp_path / "7-0123456789abcdef.png"
+    foreign.write_bytes(b"someone else's")
+
+    for index, previous in enumerate(
+        (
+            "https://api.dicebear.com/7.x/identicon/svg?seed=Smaug",
+            f"/static/creatures/{foreign.name}",
+            "/static/creatures/../7-0123456789abcdef.png",
+            None,  # then: the creature's own generated image
+        )
+    ):
+        creature = Creature(
+            name=f"Redrawn {index}",
+            creature_type="Test",
+            mythology="Test",
+            habitat="Test",
+            danger_level=1,
+            image_status="pending",
+            image_url=previous,
+        )
+        session.add(creature)
+        session.commit()
+        if previous is None:
+            own = tmp_path / f"{creature.id}-fedcba9876543210.png"
+            own.write_bytes(b"old version")
+            creature.image_url = f"/static/creatures/{own.name}"
+            session.add(creature)
+            session.commit()
+        with (
+            patch.object(worker, "CREATURES_DIR", tmp_path),
+            patch("httpx.AsyncClient.post", return_value=mock_response),
+        ):
+            await generate_creature_image({}, creature.id)
+        session.refresh(creature)
+        assert creature.image_status == "ready"
+        assert foreign.exists()
+
+    assert not own.exists()
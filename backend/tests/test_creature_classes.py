@@ -1,34 +1,8 @@
-import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
-from sqlmodel.pool import StaticPool
+from sqlmodel import Session
 
-from app.app import app
-from app.db import get_session
-from app.models import Creature
-
-# Database Validation Fixtures
-engine = create_engine(
-    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
-)
-
-
-@pytest.fixture(name="session")
-def session_fixture():
-    SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
-    SQLModel.metadata.drop_all(engine)
-
-
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    def get_session_override():
-        return session
-
-    app.dependency_overrides[get_session] = get_session_override
-    yield TestClient(app)
-    app.dependency_overrides.clear()
+from app import class_registry
+from app.models import Creature, CreatureClass
 
 
 # Happy Path Tests
@@ -89,6 +63,103 @@ def test_delete_class(client: TestClient):
     assert res.status_code == 204
 
 
+def test_creature_list_embeds_class_colors(client: TestClient):
+    c_res = client.post(
+        "/classes/",
+        json={
+            "name": "Wyrm",
+            "color": "#111",
+            "border_color": "#222",
+            "text_color": "#333",
+        },
+    )
+    class_id = c_res.json()["id"]
+    client.post(
+        "/creatures/",
+        json={
+            "name": "Fafnir",
+            "mythology": "Norse",
+            "creature_type": "Wyrm",
+            "danger_level": 9,
+        },
+    )
+
+    [item] = client.get("/creatures/").json()
+    assert item["class_id"] == class_id
+    assert item["creature_class"] == {
+        "color": "#111",
+        "border_color": "#222",
+        "text_color": "#333",
+    }
+
+    # Renames keep the link; deleting the class unlinks its creatures.
+    client.put(f"/classes/{class_id}", json={"name": "Great Wyrm"})
+    [item] = client.get("/creatures/").json()
+    assert item["creature_type"] == "Great Wyrm"
+    assert item["class_id"] == class_id
+
+    client.delete(f"/classes/{class_id}")
+    [item] = client.get("/creatures/").json()
+    assert item["class_id"] is None
+    assert item["creature_class"] is None
+
+    # Re-creating the class relinks its creatures; search results embed it too.
+    c_res = client.post("/classes/", json={"name": "Great Wyrm", "color": "#444"})
+    [item] = client.get("/creatures/").json()
+    assert item["class_id"] == c_res.json()["id"]
+    [found] = client.get("/creatures/search", params={"q": "Fafnir"}).json()
+    assert found["creature_class"]["color"] == "#444"
+
+    # Moving a creature to an unknown class registers and links it.
+    client.put(
+        f"/creatures/{item['id']}",
+        json={
+            "name": "Fafnir",
+            "mythology": "Norse",
+            "creature_type": "Serpent",
+            "danger_level": 9,
+        },
+    )
+    [item] = client.get("/creatures/").json()
+    classes = {c["name"]: c["id"] for c in client.get("/classes/").json()}
+    assert item["class_id"] == classes["Serpent"]
+    assert item["creature_class"] is not None
+
+
+def test_class_registry_follows_redis_version(
+    client: TestClient, session: Session, async_engine, fake_redis
+):
+    from sqlalchemy import event
+
+    redis = fake_redis
+    class_registry.configure(redis)
+    try:
+        assert client.get("/classes/").json() == []
+
+        # Another process adds a class: served from memory until it bumps.
+        statements = []
+        event.listen(
+            async_engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        session.add(CreatureClass(name="Elsewhere"))
+        session.commit()
+        assert client.get("/classes/").json() == []
+        assert statements == []
+
+        redis.data[class_registry.VERSION_KEY] = 1
+        assert [c["name"] for c in client.get("/classes/").json()] == ["Elsewhere"]
+
+        # Writes through this process bump the shared version.
+        client.post("/classes/", json={"name": "Local"})
+        assert redis.data[class_registry.VERSION_KEY] == 2
+        names = [c["name"] for c in client.get("/classes/").json()]
+        assert names == ["Elsewhere", "Local"]
+    finally:
+        class_registry.configure(None)
+
+
 # Error Handling Tests (404)
 
 
@@ -23,6 +23,35 @@ def test_create_creature(client: TestClient):
     assert data["image_url"] is None
 
 
+def test_create_creature_writes_without_selects(client: TestClient, async_engine):
+    from sqlalchemy import event
+
+    client.post("/classes/", json={"name": "Cephalopod"})
+    client.get("/classes/")  # loads the class registry
+
+    statements = []
+    event.listen(
+        async_engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    payload = {
+        "name": "Kraken",
+        "mythology": "Norse",
+        "creature_type": "Cephalopod",
+        "danger_level": 8,
+    }
+    response = client.post("/creatures/", json=payload)
+    assert response.status_code == 200
+    assert response.json()["creature_type"] == "Cephalopod"
+    # A known class needs no lookup; INSERT ... RETURNING needs no refresh.
+    assert [s.split()[0] for s in statements] == ["INSERT"]
+
+    response = client.post("/creatures/", json=payload)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Creature already exists"
+
+
 def test_get_creatures(client: TestClient):
     payload = {
         "name": "Unicorn",
@@ -115,6 +144,171 @@ def test_delete_creature_not_found(client: TestClient):
 # Validation Tests (422)
 
 
+def test_create_creature_enqueues_on_shared_pool(client: TestClient, mock_redis):
+    payload = {
+        "name": "Pooled",
+        "mythology": "Norse",
+        "creature_type": "Reptile",
+        "danger_level": 4,
+    }
+    for suffix in ("A", "B"):
+        res = client.post("/creatures/", json=payload | {"name": f"Pooled {suffix}"})
+        assert res.status_code == 200
+
+    assert mock_redis.return_value.pipeline.return_value.execute.await_count == 2
+    mock_redis.assert_not_called()  # no connection opened per request
+    mock_redis.return_value.aclose.assert_not_called()
+
+
+def test_image_jobs_have_deterministic_ids_and_collapse(client: TestClient, mock_redis):
+    import asyncio
+    from app.queue import enqueue_jobs, image_content_hash, image_job
+    from app.models import CreatureCreate
+
+    pipe = mock_redis.return_value.pipeline.return_value
+    payload = {
+        "name": "Hashed",
+        "mythology": "Norse",
+        "creature_type": "Reptile",
+        "danger_level": 4,
+    }
+    creature = client.post("/creatures/", json=payload).json()
+    content_hash = image_content_hash(CreatureCreate.model_validate(payload))
+    job_id = f"image:{creature['id']}:{content_hash}"
+
+    # The job key and queue entry are only written if absent.
+    key, _ = pipe.set.call_args.args
+    assert key == f"arq:job:{job_id}"
+    assert pipe.set.call_args.kwargs["nx"] is True
+    assert list(pipe.zadd.call_args.args[1]) == [job_id]
+    assert pipe.zadd.call_args.kwargs["nx"] is True
+
+    # Danger level is not part of the prompt; the hash ignores it.
+    assert (
+        image_content_hash(CreatureCreate.model_validate(payload | {"danger_level": 9}))
+        == content_hash
+    )
+    assert (
+        image_content_hash(
+            CreatureCreate.model_validate(payload | {"habitat": "Fjord"})
+        )
+        != content_hash
+    )
+
+    # A job id that is already queued (SET NX answers None) is not new.
+    pipe.execute.return_value = [True, 1, None, 0]
+    item = CreatureCreate.model_validate(payload)
+    new = asyncio.run(
+        enqueue_jobs(
+            mock_redis.return_value,
+            "generate_creature_image",
+            [image_job(1, item), image_job(2, item)],
+        )
+    )
+    assert new == [f"image:1:{content_hash}"]
+
+
+def test_enqueued_jobs_are_read_back_by_arq(fake_redis):
+    import asyncio
+    from arq.jobs import Job
+    from app.queue import enqueue_jobs
+
+    async def round_trip():
+        job_ids = await enqueue_jobs(
+            fake_redis,
+            "generate_creature_image",
+            [((7,), {"request_id": "req-1", "_job_id": "image:7:abc"}), ((8,), {})],
+            defer_by_ms=5000,
+        )
+        infos = [
+            await Job(job_id, fake_redis, _queue_name="arq:queue").info()
+            for job_id in job_ids
+        ]
+        return job_ids, infos
+
+    job_ids, (named, anonymous) = asyncio.run(round_trip())
+    # arq's own reader sees what ArqRedis.enqueue_job would have written.
+    assert job_ids[0] == "image:7:abc" and len(job_ids) == 2
+    assert named.function == "generate_creature_image"
+    assert named.args == (7,)
+    assert named.kwargs == {"request_id": "req-1"}
+    assert named.score - 5000 == round(named.enqueue_time.timestamp() * 1000)
+    assert anonymous.args == (8,) and anonymous.kwargs == {}
+
+
+def test_prompt_edits_queue_one_debounced_regeneration(client: TestClient, mock_redis):
+    from app.services import creatures as service
+
+    pool = mock_redis.return_value
+    pipe = pool.pipeline.return_value
+    payload = {
+        "name": "Morphing",
+        "mythology": "Greek",
+        "creature_type": "Shifter",
+        "danger_level": 3,
+        "habitat": "Cave",
+    }
+    creature_id = client.post("/creatures/", json=payload).json()["id"]
+    first_job = pool.set.call_args.args[1]
+    assert pool.set.call_args.args[0] == f"bestiary:image-job:{creature_id}"
+    pipe.reset_mock()
+
+    # Not a prompt field: no regeneration.
+    res = client.put(f"/creatures/{creature_id}", json=payload | {"danger_level": 7})
+    assert res.status_code == 200
+    pipe.execute.assert_not_awaited()
+
+    # A prompt edit replaces the tracked job with a deferred one.
+    pool.set.return_value = first_job.encode()
+    res = client.put(f"/creatures/{creature_id}", json=payload | {"habitat": "Sea"})
+    assert res.json()["image_status"] == "pending"
+    second_job = pool.set.call_args.args[1]
+    assert second_job != first_job
+    pipe.zrem.assert_called_once_with("arq:queue", first_job)
+    pipe.delete.assert_called_once_with(f"arq:job:{first_job}")
+    debounce_ms = int(service.IMAGE_REGEN_DEBOUNCE_SECONDS * 1000)
+    assert pipe.set.call_args.kwargs["px"] == debounce_ms + pool.expires_extra_ms
+    pipe.reset_mock()
+
+    # Deleting the creature cancels the pending regeneration.
+    pool.getdel.return_value = second_job.encode()
+    assert client.delete(f"/creatures/{creature_id}").status_code == 200
+    pool.getdel.assert_awaited_once_with(f"bestiary:image-job:{creature_id}")
+    pipe.zrem.assert_called_once_with("arq:queue", second_job)
+
+
+def test_prompt_edit_without_job_queue_does_not_leave_image_pending(
+    client: TestClient, mock_redis
+):
+    from app.app import app
+    from app.queue import get_arq_pool
+    from app.services import creatures as service
+
+    pool = mock_redis.return_value
+    payload = {
+        "name": "Unqueued",
+        "mythology": "Greek",
+        "creature_type": "Shifter",
+        "danger_level": 3,
+        "habitat": "Cave",
+    }
+    creature_id = client.post("/creatures/", json=payload).json()["id"]
+
+    # Redis is down: nothing would ever move a "pending" image on.
+    app.dependency_overrides[get_arq_pool] = lambda: None
+    res = client.put(f"/creatures/{creature_id}", json=payload | {"habitat": "Sea"})
+    assert res.json()["image_status"] == "failed"
+    assert res.json()["image_error"] == service.IMAGE_QUEUE_DOWN
+
+    # The pool is there but the enqueue fails.
+    app.dependency_overrides[get_arq_pool] = lambda: pool
+    pool.set.side_effect = ConnectionError("Redis went away")
+    res = client.put(f"/creatures/{creature_id}", json=payload | {"habitat": "Sky"})
+    assert res.json()["image_status"] == "failed"
+    creature = client.get(f"/creatures/{creature_id}").json()
+    assert creature["habitat"] == "Sky" and creature["image_status"] == "failed"
+
+
 def test_create_creature_missing_field(client: TestClient):
     # Missing 'name'
     payload = {
@@ -190,3 +384,745 @@ def test_update_then_read_reflects_change(client: TestClient):
     res = client.get(f"/creatures/{cid}")
     assert res.status_code == 200
     assert res.json()["name"] == "V2"  # Should match V2
+
+
+# Pagination
+
+
+def test_list_creatures_paginates_with_cursor(client: TestClient):
+    for i in range(5):
+        client.post(
+            "/creatures/",
+            json={
+                "name": f"Paged {i}",
+                "mythology": "Test",
+                "creature_type": "Test",
+                "danger_level": 1,
+            },
+        )
+
+    seen = []
+    url = "/creatures/?limit=2"
+    while url:
+        res = client.get(url)
+        assert res.status_code == 200
+        page = res.json()
+        assert len(page) <= 2
+        seen.extend(c["name"] for c in page)
+        url = res.links.get("next", {}).get("url")
+
+    assert seen == [f"Paged {i}" for i in range(5)]
+
+
+def test_list_creatures_last_page_has_no_next_link(client: TestClient):
+    client.post(
+        "/creatures/",
+        json={
+            "name": "Lonely",
+            "mythology": "Test",
+            "creature_type": "Test",
+            "danger_level": 1,
+        },
+    )
+    res = client.get("/creatures/?limit=10")
+    assert res.status_code == 200
+    assert "link" not in res.headers
+    assert "x-next-cursor" not in res.headers
+
+
+def test_list_creatures_invalid_cursor(client: TestClient):
+    res = client.get("/creatures/?cursor=not-a-cursor")
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Invalid cursor"
+
+
+# Server-side filtering
+
+
+def _seed_filter_creatures(client: TestClient):
+    rows = [
+        ("Fafnir", "Draconic", "Norse", 9, "Cave"),
+        ("Ladon", "Draconic", "Greek", 7, "Garden"),
+        ("Cerberus", "Beast", "Greek", 8, "Underworld"),
+        ("Fenrir", "Beast", "Norse", 10, "Forest"),
+        ("Pixie", "Fae", "Celtic", 2, "Forest"),
+    ]
+    for name, ctype, myth, danger, habitat in rows:
+        client.post(
+            "/creatures/",
+            json={
+                "name": name,
+                "creature_type": ctype,
+                "mythology": myth,
+                "danger_level": danger,
+                "habitat": habitat,
+            },
+        )
+
+
+def test_list_creatures_filters(client: TestClient):
+    _seed_filter_creatures(client)
+
+    def names(params):
+        res = client.get("/creatures/", params=params)
+        assert res.status_code == 200
+        return sorted(c["name"] for c in res.json())
+
+    assert names({"q": "FEN"}) == ["Fenrir"]
+    assert names({"creature_type": ["Draconic", "Fae"]}) == ["Fafnir", "Ladon", "Pixie"]
+    assert names({"mythology": "Greek"}) == ["Cerberus", "Ladon"]
+    assert names({"habitat": "Forest", "min_danger": 5}) == ["Fenrir"]
+    assert names({"creature_type": "Draconic", "max_danger": 8}) == ["Ladon"]
+
+
+def test_list_creatures_name_filter_escapes_wildcards(client: TestClient):
+    _seed_filter_creatures(client)
+    res = client.get("/creatures/", params={"q": "%"})
+    assert res.status_code == 200
+    assert res.json() == []
+
+
+def test_list_creatures_filters_combine_with_pagination(client: TestClient):
+    _seed_filter_creatures(client)
+    res = client.get("/creatures/", params={"creature_type": "Beast", "limit": 1})
+    assert [c["name"] for c in res.json()] == ["Cerberus"]
+
+    res = client.get(res.links["next"]["url"])
+    assert [c["name"] for c in res.json()] == ["Fenrir"]
+    assert "next" not in res.links
+
+
+# Name search
+
+
+def test_search_creatures_ranked(client: TestClient):
+    _seed_filter_creatures(client)
+    client.post(
+        "/creatures/",
+        json={
+            "name": "Fenrir's Whelp",
+            "creature_type": "Beast",
+            "mythology": "Norse",
+            "danger_level": 4,
+        },
+    )
+
+    res = client.get("/creatures/search", params={"q": "fenr"})
+    assert res.status_code == 200
+    assert [c["name"] for c in res.json()] == ["Fenrir", "Fenrir's Whelp"]
+
+    res = client.get("/creatures/search", params={"q": "fenr", "limit": 1})
+    assert [c["name"] for c in res.json()] == ["Fenrir"]
+
+
+def test_search_creatures_short_query(client: TestClient):
+    _seed_filter_creatures(client)
+    res = client.get("/creatures/search", params={"q": "fa"})
+    assert res.status_code == 200
+    assert [c["name"] for c in res.json()] == ["Fafnir"]
+
+
+def test_search_creatures_tracks_updates_and_deletes(client: TestClient):
+    res = client.post(
+        "/creatures/",
+        json={
+            "name": "Basilisk",
+            "creature_type": "Reptile",
+            "mythology": "Greek",
+            "danger_level": 9,
+        },
+    )
+    cid = res.json()["id"]
+    client.put(
+        f"/creatures/{cid}",
+        json={
+            "name": "Cockatrice",
+            "creature_type": "Reptile",
+            "mythology": "Greek",
+            "danger_level": 9,
+        },
+    )
+    assert client.get("/creatures/search", params={"q": "basil"}).json() == []
+    assert [
+        c["id"] for c in client.get("/creatures/search", params={"q": "atric"}).json()
+    ] == [cid]
+
+    client.delete(f"/creatures/{cid}")
+    assert client.get("/creatures/search", params={"q": "atric"}).json() == []
+
+
+def test_search_creatures_requires_query(client: TestClient):
+    assert client.get("/creatures/search").status_code == 422
+
+
+# Dashboard statistics
+
+
+def test_creature_stats(client: TestClient, session):
+    from datetime import datetime, timedelta, timezone
+    from app.models import Creature
+
+    _seed_filter_creatures(client)  # 5 fresh creatures, 2 with danger >= 9
+    session.add(
+        Creature(
+            name="Ancient",
+            mythology="Test",
+            creature_type="Test",
+            danger_level=9,
+            last_modify=datetime.now(timezone.utc) - timedelta(days=40),
+        )
+    )
+    session.add(
+        Creature(name="Legacy", mythology="Test", creature_type="Test", danger_level=1)
+    )
+    session.commit()
+
+    res = client.get("/creatures/stats")
+    assert res.status_code == 200
+    assert res.json() == {
+        "total": 7,
+        "critical": 3,
+        "added_this_month": 5,
+        "added_last_24h": 5,
+    }
+
+
+def test_creature_stats_refresh_after_write(client: TestClient):
+    assert client.get("/creatures/stats").json()["total"] == 0
+
+    res = client.post(
+        "/creatures/",
+        json={
+            "name": "Kraken",
+            "mythology": "Norse",
+            "creature_type": "Abyssal",
+            "danger_level": 10,
+        },
+    )
+    stats = client.get("/creatures/stats").json()
+    assert stats["total"] == 1
+    assert stats["critical"] == 1
+
+    client.delete(f"/creatures/{res.json()['id']}")
+    assert client.get("/creatures/stats").json()["total"] == 0
+
+
+# Timestamps and recency
+
+
+def test_last_modify_is_utc_timestamp(client: TestClient):
+    from datetime import datetime, timezone
+
+    res = client.post(
+        "/creatures/",
+        json={
+            "name": "Timestamped",
+            "mythology": "Test",
+            "creature_type": "Test",
+            "danger_level": 1,
+        },
+    )
+    stamp = datetime.fromisoformat(res.json()["last_modify"])
+    assert stamp.tzinfo is not None
+    assert abs((datetime.now(timezone.utc) - stamp).total_seconds()) < 60
+
+
+def test_list_creatures_recency_sort_and_modified_since(client: TestClient, session):
+    from datetime import datetime, timedelta, timezone
+    from app.models import Creature
+
+    now = datetime.now(timezone.utc)
+    for name, age_days in [("Old", 30), ("Older", 60), ("Newer", 1), ("Newest", 0)]:
+        session.add(
+            Creature(
+                name=name,
+                mythology="Test",
+                creature_type="Test",
+                danger_level=1,
+                last_modify=now - timedelta(days=age_days),
+            )
+        )
+    session.add(
+        Creature(name="Undated", mythology="Test", creature_type="Test", danger_level=1)
+    )
+    session.commit()
+
+    seen = []
+    url = "/creatures/?sort=-last_modify&limit=2"
+    while url:
+        res = client.get(url)
+        assert res.status_code == 200
+        seen.extend(c["name"] for c in res.json())
+        url = res.links.get("next", {}).get("url")
+    assert seen == ["Newest", "Newer", "Old", "Older", "Undated"]
+
+    since = (now - timedelta(days=7)).isoformat()
+    res = client.get("/creatures/", params={"modified_since": since})
+    assert sorted(c["name"] for c in res.json()) == ["Newer", "Newest"]
+
+
+def test_list_creatures_cursor_bound_to_sort(client: TestClient):
+    for i in range(2):
+        client.post(
+            "/creatures/",
+            json={
+                "name": f"Sorted {i}",
+                "mythology": "Test",
+                "creature_type": "Test",
+                "danger_level": 1,
+            },
+        )
+    res = client.get("/creatures/?limit=1")
+    cursor = res.headers["x-next-cursor"]
+    res = client.get(f"/creatures/?limit=1&sort=-last_modify&cursor={cursor}")
+    assert res.status_code == 400
+
+
+# Facets
+
+
+def test_creature_facets(client: TestClient):
+    _seed_filter_creatures(client)
+
+    res = client.get("/creatures/facets")
+    assert res.status_code == 200
+    facets = res.json()
+    assert facets["creature_type"] == [
+        {"value": "Beast", "count": 2},
+        {"value": "Draconic", "count": 2},
+        {"value": "Fae", "count": 1},
+    ]
+    assert {f["value"] for f in facets["habitat"]} == {
+        "Cave",
+        "Garden",
+        "Underworld",
+        "Forest",
+    }
+
+
+def test_creature_facets_narrowed_by_other_filters(client: TestClient):
+    _seed_filter_creatures(client)
+
+    facets = client.get(
+        "/creatures/facets", params={"mythology": "Norse", "creature_type": "Beast"}
+    ).json()
+    # Class counts honour the mythology filter but not the class selection.
+    assert facets["creature_type"] == [
+        {"value": "Beast", "count": 1},
+        {"value": "Draconic", "count": 1},
+    ]
+    # Mythology counts honour the class filter but not the mythology selection.
+    assert facets["mythology"] == [
+        {"value": "Greek", "count": 1},
+        {"value": "Norse", "count": 1},
+    ]
+    assert facets["habitat"] == [{"value": "Forest", "count": 1}]
+
+
+def test_creature_facets_invalidated_by_writes(client: TestClient):
+    assert client.get("/creatures/facets").json()["mythology"] == []
+    client.post(
+        "/creatures/",
+        json={
+            "name": "Tengu",
+            "mythology": "Japanese",
+            "creature_type": "Yokai",
+            "danger_level": 4,
+        },
+    )
+    assert client.get("/creatures/facets").json()["mythology"] == [
+        {"value": "Japanese", "count": 1}
+    ]
+
+
+# Bulk create
+
+
+def test_read_endpoints_served_from_shared_response_cache(
+    client: TestClient, session, fake_redis
+):
+    from app import response_cache
+    from app.models import Creature
+
+    def add(name):
+        return client.post(
+            "/creatures/",
+            json={
+                "name": name,
+                "mythology": "Test",
+                "creature_type": "Test",
+                "danger_level": 3,
+            },
+        )
+
+    response_cache.configure(fake_redis)
+    try:
+        add("Cached A")
+        add("Cached B")
+        first = client.get("/creatures/?limit=1")
+        assert first.headers["X-Cache"] == "miss"
+        assert client.get("/creatures/stats").headers["X-Cache"] == "miss"
+
+        # Rows written behind the API's back are not seen until a bump.
+        session.add(
+            Creature(name="Sneaky", mythology="T", creature_type="T", danger_level=1)
+        )
+        session.commit()
+        again = client.get("/creatures/?limit=1")
+        assert again.headers["X-Cache"] == "hit"
+        assert again.content == first.content
+        assert again.headers["Link"] == first.headers["Link"]
+        revalidated = client.get(
+            "/creatures/?limit=1", headers={"If-None-Match": first.headers["ETag"]}
+        )
+        assert revalidated.status_code == 304
+        assert revalidated.headers["X-Cache"] == "hit"
+        stats = client.get("/creatures/stats")
+        assert stats.headers["X-Cache"] == "hit"
+        assert stats.json()["total"] == 2
+
+        # A write through the API invalidates every cached response.
+        add("Cached C")
+        stats = client.get("/creatures/stats")
+        assert stats.headers["X-Cache"] == "miss"
+        assert stats.json()["total"] == 4
+        res = client.get("/creatures/?limit=10")
+        assert [c["name"] for c in res.json()][-1] == "Cached C"
+    finally:
+        response_cache.configure(None)
+
+
+def test_shared_generation_bump_refreshes_in_process_caches(
+    client: TestClient, session, fake_redis
+):
+    import asyncio
+    from app import response_cache
+    from app.models import Creature
+
+    def add_behind_the_api(name):
+        session.add(
+            Creature(name=name, mythology="T", creature_type="T", danger_level=1)
+        )
+        session.commit()
+
+    response_cache.configure(fake_redis)
+    try:
+        add_behind_the_api("Elsewhere A")
+        assert client.get("/creatures/stats").json()["total"] == 1
+        client.get("/creatures/facets")
+
+        # Another process commits and bumps only the Redis generation; this
+        # process's in-process stats/facets must not be re-cached as fresh.
+        add_behind_the_api("Elsewhere B")
+        asyncio.run(fake_redis.incr(response_cache.GENERATION_KEY))
+        stats = client.get("/creatures/stats")
+        assert stats.headers["X-Cache"] == "miss"
+        assert stats.json()["total"] == 2
+        facets = client.get("/creatures/facets").json()
+        assert facets["creature_type"] == [{"value": "T", "count": 2}]
+
+        # Image updates from the worker only invalidate the list.
+        client.get("/creatures/")
+        asyncio.run(response_cache.bump_image_generation(fake_redis))
+        assert client.get("/creatures/stats").headers["X-Cache"] == "hit"
+        assert client.get("/creatures/facets").headers["X-Cache"] == "hit"
+        assert client.get("/creatures/").headers["X-Cache"] == "miss"
+    finally:
+        response_cache.configure(None)
+
+
+def test_conditional_get_returns_304_until_data_changes(client: TestClient):
+    res = client.post(
+        "/creatures/",
+        json={
+            "name": "Tagged",
+            "mythology": "Test",
+            "creature_type": "Test",
+            "danger_level": 2,
+        },
+    )
+    creature_id = res.json()["id"]
+    client.post("/tags", json={"name": "Shiny"})
+
+    for url in ("/creatures/", f"/creatures/{creature_id}", "/classes/", "/tags"):
+        first = client.get(url)
+        etag = first.headers["ETag"]
+        assert etag.startswith('"')
+        again = client.get(url, headers={"If-None-Match": etag})
+        assert again.status_code == 304, url
+        assert again.content == b""
+        assert again.headers["ETag"] == etag
+        other = client.get(url, headers={"If-None-Match": '"stale", W/' + etag})
+        assert other.status_code == 304, url
+
+    etag = client.get(f"/creatures/{creature_id}").headers["ETag"]
+    client.put(
+        f"/creatures/{creature_id}",
+        json={
+            "name": "Tagged",
+            "mythology": "Test",
+            "creature_type": "Test",
+            "danger_level": 3,
+        },
+    )
+    res = client.get(f"/creatures/{creature_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.json()["danger_level"] == 3
+    assert res.headers["ETag"] != etag
+
+
+def test_bulk_create_reports_per_item_status(client: TestClient, mock_redis):
+    pipe = mock_redis.return_value.pipeline.return_value
+
+    client.post(
+        "/creatures/",
+        json={
+            "name": "Existing",
+            "mythology": "Test",
+            "creature_type": "Test",
+            "danger_level": 1,
+        },
+    )
+    pipe.reset_mock()
+
+    payload = [
+        {
+            "name": "Bulk A",
+            "mythology": "Norse",
+            "creature_type": "New Class",
+            "danger_level": 3,
+        },
+        {
+            "name": "Bulk B",
+            "mythology": "Greek",
+            "creature_type": "Test",
+            "danger_level": 11,
+        },
+        {
+            "name": "Existing",
+            "mythology": "Test",
+            "creature_type": "Test",
+            "danger_level": 1,
+        },
+        {
+            "name": "Bulk A",
+            "mythology": "Norse",
+            "creature_type": "Test",
+            "danger_level": 2,
+        },
+        {
+            "name": "Bulk C",
+            "mythology": "Celtic",
+            "creature_type": "Test",
+            "danger_level": 5,
+        },
+    ]
+    res = client.post("/creatures/bulk", json=payload)
+    assert res.status_code == 200
+    body = res.json()
+    assert body["created"] == 2
+    assert body["failed"] == 3
+    assert [item["status"] for item in body["items"]] == [
+        "created",
+        "invalid",
+        "conflict",
+        "conflict",
+        "created",
+    ]
+    assert "danger_level" in body["items"][1]["detail"]
+
+    # Created rows are readable and the missing class was registered.
+    created_id = body["items"][0]["id"]
+    creature = client.get(f"/creatures/{created_id}").json()
+    assert creature["name"] == "Bulk A"
+    assert creature["image_status"] == "pending"
+    assert "New Class" in [c["name"] for c in client.get("/classes/").json()]
+
+    # Both image jobs went out in one pipeline round-trip.
+    pipe.execute.assert_awaited_once()
+    assert pipe.zadd.call_count == 2
+
+
+def test_bulk_create_reports_names_taken_concurrently(client: TestClient, session):
+    from unittest.mock import patch
+    from app.models import Creature
+    from app.services import creatures as service
+
+    chunks = service.chunks
+    racing = True
+
+    def chunks_then_race(items, size):
+        nonlocal racing
+        yield from chunks(items, size)
+        if racing:
+            # Another request commits one of the names right after the check.
+            racing = False
+            session.add(
+                Creature(
+                    name="Racer",
+                    mythology="Test",
+                    creature_type="Test",
+                    danger_level=1,
+                )
+            )
+            session.commit()
+
+    payload = [
+        {"name": name, "mythology": "Test", "creature_type": "Test", "danger_level": 2}
+        for name in ("Racer", "Runner")
+    ]
+    with patch.object(service, "chunks", chunks_then_race):
+        res = client.post("/creatures/bulk", json=payload)
+    assert res.status_code == 200
+    body = res.json()
+    assert (body["created"], body["failed"]) == (1, 1)
+    racer, runner = body["items"]
+    assert racer["status"] == "conflict" and racer["id"] is None
+    assert runner["status"] == "created" and runner["id"]
+
+
+def test_bulk_create_rejects_empty_list(client: TestClient):
+    assert client.post("/creatures/bulk", json=[]).status_code == 422
+
+
+# Export
+
+
+def test_export_ndjson_with_tags(client: TestClient, monkeypatch):
+    import json
+    from app.services import creature_io
+
+    monkeypatch.setattr(creature_io, "EXPORT_BATCH_SIZE", 2)  # span batches
+    _seed_filter_creatures(client)
+    client.post("/tags", json={"name": "Fire"})
+    client.post("/tags", json={"name": "Ancient"})
+    client.post("/creatures/Fafnir/tags/Fire")
+    client.post("/creatures/Fafnir/tags/Ancient")
+
+    res = client.get("/creatures/export", params={"include_tags": True})
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in res.text.splitlines()]
+    assert [r["name"] for r in rows] == [
+        "Fafnir",
+        "Ladon",
+        "Cerberus",
+        "Fenrir",
+        "Pixie",
+    ]
+    assert rows[0]["tags"] == ["Ancient", "Fire"]
+    assert rows[1]["tags"] == []
+    assert rows[0]["last_modify"] is not None
+
+
+def test_export_csv_filtered(client: TestClient):
+    import csv
+    import io
+
+    _seed_filter_creatures(client)
+    res = client.get(
+        "/creatures/export", params={"format": "csv", "mythology": "Greek"}
+    )
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(res.text)))
+    assert [r["name"] for r in rows] == ["Ladon", "Cerberus"]
+    assert rows[0]["danger_level"] == "7"
+    assert "tags" not in rows[0]
+
+
+def test_export_empty_csv_has_header(client: TestClient):
+    res = client.get("/creatures/export", params={"format": "csv"})
+    assert res.status_code == 200
+    assert res.text.splitlines()[0].startswith("name,")
+
+
+# Import
+
+
+def test_import_ndjson_upserts_and_reports_rejects(
+    client: TestClient, mock_redis, monkeypatch
+):
+    import json
+    from app.services import creature_io
+
+    monkeypatch.setattr(creature_io, "IMPORT_BATCH_SIZE", 2)  # span batches
+    _seed_filter_creatures(client)
+    pipe = mock_redis.return_value.pipeline.return_value
+    pipe.reset_mock()  # seeding enqueued image jobs too
+
+    lines = [
+        json.dumps(
+            {
+                "name": "Fafnir",
+                "creature_type": "Draconic",
+                "mythology": "Norse",
+                "danger_level": 10,
+            }
+        ),
+        json.dumps(
+            {
+                "name": "Kraken",
+                "creature_type": "Abyssal",
+                "mythology": "Norse",
+                "danger_level": 9,
+                "habitat": "Ocean",
+            }
+        ),
+        "",
+        "{not json",
+        json.dumps({"name": "Broken", "mythology": "X", "danger_level": 3}),
+        json.dumps(
+            {
+                "name": "Griffin",
+                "creature_type": "Chimeric",
+                "mythology": "Greek",
+                "danger_level": 6,
+            }
+        ),
+    ]
+    res = client.post(
+        "/creatures/import",
+        files={"file": ("bestiary.ndjson", "\n".join(lines) + "\n")},
+    )
+    assert res.status_code == 200
+    summary = res.json()
+    assert summary["processed"] == 5
+    assert (summary["inserted"], summary["updated"], summary["rejected"]) == (2, 1, 2)
+    assert [r["line"] for r in summary["rejects"]] == [4, 5]
+    assert "creature_type" in summary["rejects"][1]["detail"]
+
+    fafnir = client.get("/creatures/1").json()
+    # Upserts replace the record; omitted fields take their defaults.
+    assert fafnir["danger_level"] == 10 and fafnir["habitat"] == "Unknown"
+    kraken = client.get("/creatures/", params={"q": "Kraken"}).json()[0]
+    assert kraken["image_status"] == "pending"
+    assert "Abyssal" in [c["name"] for c in client.get("/classes/").json()]
+
+    # New creatures only, deferred behind interactive work.
+    assert pipe.zadd.call_count == 2
+    assert pipe.execute.await_count == 2  # one pipeline per batch with new rows
+    expires_ms = pipe.set.call_args.kwargs["px"]
+    assert expires_ms == creature_io.IMPORT_IMAGE_DEFER_MS + 86_400_000
+
+
+def test_import_csv_round_trips_export(client: TestClient):
+    _seed_filter_creatures(client)
+    exported = client.get("/creatures/export", params={"format": "csv"}).text
+    for creature_id in range(1, 6):
+        client.delete(f"/creatures/{creature_id}")
+
+    res = client.post(
+        "/creatures/import",
+        files={"file": ("dump.txt", exported)},
+        params={"format": "csv"},
+    )
+    assert res.status_code == 200
+    assert res.json()["inserted"] == 5 and res.json()["rejected"] == 0
+    names = sorted(c["name"] for c in client.get("/creatures/").json())
+    assert names == ["Cerberus", "Fafnir", "Fenrir", "Ladon", "Pixie"]
+
+
+def test_import_requires_known_format(client: TestClient):
+    res = client.post("/creatures/import", files={"file": ("dump.txt", "x")})
+    assert res.status_code == 400
@@ -0,0 +1,178 @@
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from app import db
+
+
+def _timed_engine(tmp_path, stats):
+    return create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=db._timed_pool(QueuePool, stats),
+        pool_size=1,
+        max_overflow=0,
+    )
+
+
+def test_timed_pool_records_checkouts(tmp_path):
+    stats = db.PoolWaitStats()
+    engine = _timed_engine(tmp_path, stats)
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    status = db.pool_status(engine.pool)
+    assert status["pool"] == "TimedQueuePool"
+    assert status["checkouts"] == 3
+    assert status["checked_out"] == 0 and status["checked_in"] == 1
+    engine.dispose()
+
+
+def test_idle_ping_replaces_dead_connection(tmp_path):
+    engine = _timed_engine(tmp_path, db.PoolWaitStats())
+    db._ping_when_idle(engine, idle_seconds=0)
+    with engine.connect() as conn:
+        first = conn.connection.dbapi_connection
+
+    # The pooled connection "died" while idle: the pool must swap it out.
+    with patch.object(engine.dialect, "do_ping", return_value=False) as ping:
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+            assert conn.connection.dbapi_connection is not first
+    ping.assert_called()
+    engine.dispose()
+
+
+def test_pool_endpoint_is_internal(client):
+    from app.auth import create_access_token
+
+    def get_as(role):
+        token = create_access_token({"sub": "ops", "role": role})
+        return client.get(
+            "/internal/pool", headers={"Authorization": f"Bearer {token}"}
+        )
+
+    assert client.get("/internal/pool").status_code == 401
+    assert get_as("user").status_code == 403
+    res = get_as("admin")
+    assert res.status_code == 200
+    body = res.json()
+    assert set(body["engines"]) == {"sync", "async"}
+    assert body["settings"]["pool_size"] == db.DB_POOL_SIZE
+    assert "/internal/pool" not in client.get("/openapi.json").json()["paths"]
+
+
+def test_routing_session_sends_writes_to_writer(tmp_path):
+    from sqlmodel import SQLModel, select
+    from app.models import Tag
+
+    # Separate files make it visible which engine served each statement.
+    reader = create_engine(f"sqlite:///{tmp_path / 'reader.db'}")
+    writer = create_engine(f"sqlite:///{tmp_path / 'writer.db'}")
+    for engine in (reader, writer):
+        SQLModel.metadata.create_all(engine)
+
+    with db.RoutingSession(reader=reader, writer=writer) as session:
+        assert session.exec(select(Tag)).all() == []
+        session.add(Tag(name="Fire"))
+        session.flush()
+        # The transaction has written: it keeps reading its own writes.
+        assert [t.name for t in session.exec(select(Tag))] == ["Fire"]
+        session.commit()
+        # A new transaction reads from the reader again.
+        assert session.exec(select(Tag)).all() == []
+
+    with writer.connect() as conn:
+        assert conn.execute(text("SELECT name FROM tag")).scalars().all() == ["Fire"]
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    db._apply_sqlite_pragmas(engine)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert (
+            conn.exec_driver_sql("PRAGMA busy_timeout").scalar()
+            == db.SQLITE_PRAGMAS["busy_timeout"]
+        )
+    engine.dispose()
+
+
+def test_reads_use_replica_except_right_after_own_writes(client, tmp_path):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+    from sqlmodel import SQLModel
+    from fastapi.testclient import TestClient
+    from app.app import app
+
+    # A replica that never receives the writes (i.e. maximal lag).
+    replica_path = tmp_path / "replica.db"
+    SQLModel.metadata.create_all(create_engine(f"sqlite:///{replica_path}"))
+    replica = create_async_engine(
+        f"sqlite+aiosqlite:///{replica_path}", poolclass=NullPool
+    )
+
+    with patch.object(db, "async_read_engines", [replica]):
+        res = client.post("/tags", json={"name": "Fire"})
+        assert db.READ_YOUR_WRITES_COOKIE in res.cookies
+
+        # The writer reads its own write from the primary...
+        assert [t["name"] for t in client.get("/tags").json()] == ["Fire"]
+        # ...while other clients are served by the replica.
+        assert TestClient(app).get("/tags").json() == []
+
+        # Once the window has passed, the writer is back on the replica.
+        client.cookies.set(db.READ_YOUR_WRITES_COOKIE, "0")
+        assert client.get("/tags").json() == []
+
+
+def test_read_before_write_transactions_run_on_the_writer(client, async_engine):
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    # Production profile: a separate writer engine on the same SQLite file.
+    writer = create_async_engine(async_engine.url, poolclass=NullPool)
+    for engine in (async_engine, writer):
+        db._apply_sqlite_pragmas(engine.sync_engine)
+    served = {"reader": [], "writer": []}
+    for role, engine in (("reader", async_engine), ("writer", writer)):
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args, role=role: served[role].append(
+                statement
+            ),
+        )
+
+    with patch.object(db, "async_writer_engine", writer):
+        class_id = client.post("/classes/", json={"name": "Serpent"}).json()["id"]
+        creature_id = client.post(
+            "/creatures/",
+            json={
+                "name": "Jormungandr",
+                "mythology": "Norse",
+                "creature_type": "Serpent",
+                "danger_level": 10,
+            },
+        ).json()["id"]
+        client.get("/classes/")  # loads the class registry
+        served["reader"].clear()
+
+        # Each of these SELECTs the rows it is about to change.
+        res = client.put(
+            f"/creatures/{creature_id}",
+            json={
+                "name": "Jormungandr",
+                "mythology": "Norse",
+                "creature_type": "Serpent",
+                "danger_level": 9,
+            },
+        )
+        assert res.status_code == 200
+        res = client.put(f"/classes/{class_id}", json={"name": "Wyrm"})
+        assert res.json()["name"] == "Wyrm"
+        assert client.delete(f"/creatures/{creature_id}").status_code == 200
+
+    assert served["reader"] == []
+    assert any(s.lstrip().upper().startswith("SELECT") for s in served["writer"])
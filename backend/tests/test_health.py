@@ -14,3 +14,28 @@ def test_openapi_accessible():
     """Verify that the OpenAPI JSON schema is reachable."""
     response = client.get("/openapi.json")
     assert response.status_code == 200
+
+
+def test_redis_pool_is_reconnected_in_the_background():
+    """A Redis outage at startup does not disable enqueueing for good."""
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock, patch
+    from app import app as app_module, class_registry, response_cache
+
+    pool = MagicMock()
+    try:
+        with (
+            patch.object(
+                app_module,
+                "create_arq_pool",
+                AsyncMock(side_effect=[ConnectionError("down"), pool]),
+            ),
+            patch("app.app.asyncio.sleep", AsyncMock()) as sleep,
+        ):
+            asyncio.run(app_module.connect_arq_pool_with_backoff(app))
+        assert app.state.arq_pool is pool
+        assert response_cache._redis is pool and class_registry._redis is pool
+        # Backoff doubles after each failure.
+        assert [c.args[0] for c in sleep.await_args_list] == [1.0, 2.0]
+    finally:
+        app_module.use_arq_pool(app, None)
@@ -1,7 +1,7 @@
 import random
 from sqlmodel import Session, select
 from app.db import engine
-from app.models import Creature
+from app.models import Creature, CreatureClass
 
 NEW_CLASSES = [
     "Draconic",
@@ -16,6 +16,15 @@ NEW_CLASSES = [
 
 def update_creature_classes():
     with Session(engine) as session:
+        # Register the new classes so creatures stay linked to one.
+        class_ids = dict(session.exec(select(CreatureClass.name, CreatureClass.id)))
+        for name in NEW_CLASSES:
+            if name not in class_ids:
+                db_class = CreatureClass(name=name)
+                session.add(db_class)
+                session.flush()
+                class_ids[name] = db_class.id
+
         statement = select(Creature)
         creatures = session.exec(statement).all()
 
@@ -24,6 +33,7 @@ def update_creature_classes():
             # old_type = creature.creature_type
             new_type = random.choice(NEW_CLASSES)
             creature.creature_type = new_type
+            creature.class_id = class_ids[new_type]
             session.add(creature)
             count += 1
             # print(f"Updated {creature.name}: {old_type} -> {new_type}")
@@ -1,9 +1,37 @@
 import requests
 import os
+from urllib.parse import parse_qs, urlsplit
 
 # Centralize API URL
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 
+# One session per process: reuses connections and carries the backend's
+# read-your-writes cookie, so a change is visible on the very next read.
+session = requests.Session()
+
+# Last body per URL, revalidated with If-None-Match: an unchanged resource
+# comes back as an empty 304 instead of the full payload.
+MAX_CONDITIONAL_ENTRIES = 256
+_conditional_cache = {}
+
+
+def _get(url, params=None):
+    """GET `url`, returning `(json, links)`; reuses the cached body on a 304."""
+    key = requests.Request("GET", url, params=params).prepare().url
+    cached = _conditional_cache.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    response = session.get(url, params=params, headers=headers, timeout=5)
+    if response.status_code == 304 and cached:
+        return cached[1], cached[2]
+    response.raise_for_status()
+    data = response.json()
+    etag = response.headers.get("ETag")
+    if etag:
+        if len(_conditional_cache) >= MAX_CONDITIONAL_ENTRIES:
+            _conditional_cache.clear()
+        _conditional_cache[key] = (etag, data, response.links)
+    return data, response.links
+
 
 # def get_creatures():
 #     try:
@@ -25,57 +53,112 @@ API_URL = os.getenv("API_URL", "http://localhost:8000")
 #         return []
 
 
-def get_creatures():
+# Creatures per page of the list endpoint.
+PAGE_SIZE = 100
+
+
+def get_creatures_page(filters=None, cursor=None, limit=PAGE_SIZE):
+    """One page of the list and the cursor of the next one (None on the last).
+
+    `filters` maps query params (q, creature_type, mythology, habitat,
+    min_danger, max_danger) to values.
+    """
+    try:
+        params = {"limit": limit, **(filters or {})}
+        if cursor:
+            params["cursor"] = cursor
+        page, links = _get(f"{API_URL}/creatures/", params)
+        next_url = links.get("next", {}).get("url")
+        next_cursor = (
+            parse_qs(urlsplit(next_url).query)["cursor"][0] if next_url else None
+        )
+        return page, next_cursor
+    except Exception as e:
+        print("get_creatures_page failed:", repr(e))
+        return [], None
+
+
+def get_creatures(filters=None):
+    """Every matching creature, page by page (for scripts; the dashboard
+    loads pages on demand with `get_creatures_page`)."""
+    creatures, cursor = get_creatures_page(filters)
+    while cursor:
+        page, cursor = get_creatures_page(filters, cursor)
+        creatures.extend(page)
+    return creatures
+
+
+def get_stats():
     try:
-        response = requests.get(f"{API_URL}/creatures/", timeout=5)
+        return _get(f"{API_URL}/creatures/stats")[0]
+    except Exception as e:
+        print("get_stats failed:", repr(e))
+        return {"total": 0, "critical": 0, "added_this_month": 0, "added_last_24h": 0}
+
+
+def get_facets(filters=None):
+    try:
+        return _get(f"{API_URL}/creatures/facets", filters or {})[0]
+    except Exception as e:
+        print("get_facets failed:", repr(e))
+        return {"creature_type": [], "mythology": [], "habitat": []}
+
+
+# The most results GET /creatures/search returns; it has no further pages.
+SEARCH_LIMIT = 100
+
+
+def search_creatures(q, limit=SEARCH_LIMIT):
+    try:
+        response = session.get(
+            f"{API_URL}/creatures/search", params={"q": q, "limit": limit}, timeout=5
+        )
         response.raise_for_status()
         return response.json()
     except Exception as e:
-        print("get_creatures failed:", repr(e))
+        print("search_creatures failed:", repr(e))
         return []
 
 
 def get_classes():
     try:
-        response = requests.get(f"{API_URL}/classes/", timeout=5)
-        response.raise_for_status()
-        return response.json()
+        return _get(f"{API_URL}/classes/")[0]
     except Exception as e:
         print("get_classes failed:", repr(e))
         return []
 
 
 def create_creature(payload):
-    response = requests.post(f"{API_URL}/creatures/", json=payload)
+    response = session.post(f"{API_URL}/creatures/", json=payload)
     response.raise_for_status()
     return response.json()
 
 
 def update_creature(creature_id, payload):
-    response = requests.put(f"{API_URL}/creatures/{creature_id}", json=payload)
+    response = session.put(f"{API_URL}/creatures/{creature_id}", json=payload)
     response.raise_for_status()
     return response.json()
 
 
 def delete_creature(creature_id):
-    response = requests.delete(f"{API_URL}/creatures/{creature_id}")
+    response = session.delete(f"{API_URL}/creatures/{creature_id}")
     response.raise_for_status()
     return True
 
 
 def create_class(payload):
-    response = requests.post(f"{API_URL}/classes/", json=payload)
+    response = session.post(f"{API_URL}/classes/", json=payload)
     response.raise_for_status()
     return response.json()
 
 
 def update_class(class_id, payload):
-    response = requests.put(f"{API_URL}/classes/{class_id}", json=payload)
+    response = session.put(f"{API_URL}/classes/{class_id}", json=payload)
     response.raise_for_status()
     return response.json()
 
 
 def delete_class(class_id):
-    response = requests.delete(f"{API_URL}/classes/{class_id}")
+    response = session.delete(f"{API_URL}/classes/{class_id}")
     response.raise_for_status()
     return True
@@ -3,8 +3,23 @@ import api_client
 
 
 @st.cache_data(ttl=2, show_spinner=False)
-def get_creatures():
-    return api_client.get_creatures()
+def get_creatures_page(filters=None, cursor=None):
+    return api_client.get_creatures_page(dict(filters) if filters else None, cursor)
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def get_stats():
+    return api_client.get_stats()
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def get_facets(filters=None):
+    return api_client.get_facets(dict(filters) if filters else None)
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def search_creatures(q):
+    return api_client.search_creatures(q)
 
 
 @st.cache_data(ttl=2, show_spinner=False)
@@ -13,5 +28,8 @@ def get_classes():
 
 
 def clear_cache():
-    get_creatures.clear()
+    get_creatures_page.clear()
+    search_creatures.clear()
+    get_stats.clear()
+    get_facets.clear()
     get_classes.clear()
@@ -74,14 +74,45 @@ def format_time_ago(iso_str):
         return iso_str
 
 
-def get_creatures():
-    return api_utils.get_creatures()
+def get_creatures(filters, pages):
+    """The first `pages` pages of the list, and the cursor after them."""
+    creatures, cursor = api_utils.get_creatures_page(filters)
+    for _ in range(pages - 1):
+        if not cursor:
+            break
+        page, cursor = api_utils.get_creatures_page(filters, cursor)
+        creatures.extend(page)
+    return creatures, cursor
 
 
 def get_classes():
     return api_utils.get_classes()
 
 
+def build_filter_params(search_q, types, myths, habitats, danger):
+    """Hashable query params for the backend's creature filters."""
+    params = []
+    if search_q:
+        params.append(("q", search_q))
+    if types:
+        params.append(("creature_type", tuple(types)))
+    if myths:
+        params.append(("mythology", tuple(myths)))
+    if habitats:
+        params.append(("habitat", tuple(habitats)))
+    min_d, max_d = danger
+    if (min_d, max_d) != (1, 10):
+        params.extend([("min_danger", min_d), ("max_danger", max_d)])
+    return tuple(params)
+
+
+def facet_options(values, selected):
+    """Options (keeping current selections) and "name (count)" labels."""
+    counts = {v["value"]: v["count"] for v in values}
+    options = sorted(set(counts) | set(selected))
+    return options, lambda x: f"{x} ({counts.get(x, 0)})"
+
+
 def delete_creature(id):
     try:
         api_client.delete_creature(id)
@@ -286,37 +317,12 @@ with col_b:
 
 st.write("")
 
-# Metrics Logic
-creatures = get_creatures()
-total = len(creatures)
-critical = sum(1 for c in creatures if c["danger_level"] >= 9)
-
-# Calculate monthly activity
-now = datetime.datetime.now(datetime.timezone.utc)
-start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-month_name = start_of_month.strftime("%B")
-
-added_this_month = 0
-added_last_24h = 0
-one_day_ago = now - datetime.timedelta(days=1)
-
-for c in creatures:
-    try:
-        lm = c.get("last_modify")
-        if lm and lm != "Unknown":
-            dt = datetime.datetime.fromisoformat(str(lm))
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=datetime.timezone.utc)
-
-            # Monthly Check
-            if dt >= start_of_month:
-                added_this_month += 1
-
-            # 24h Check
-            if dt >= one_day_ago:
-                added_last_24h += 1
-    except Exception:
-        pass
+# Metrics Logic (aggregated by the backend)
+stats = api_utils.get_stats()
+total = stats["total"]
+critical = stats["critical"]
+added_this_month = stats["added_this_month"]
+added_last_24h = stats["added_last_24h"]
 
 # Metrics UI
 m1, m2, m3 = st.columns(3)
@@ -477,35 +483,53 @@ with f_col:
     with st.popover("Filter Options", use_container_width=True):
         st.markdown("### Filter Entities")
 
-        # 1. Extract Unique Values
-        all_types = sorted(list({c["creature_type"] for c in creatures}))
-        all_myths = sorted(list({c["mythology"] for c in creatures}))
-        all_habitats = sorted(list({c.get("habitat", "Unknown") for c in creatures}))
+        # 1. Options with counts, narrowed by the currently active filters
+        current = {
+            "types": st.session_state.get("filter_types", []),
+            "myths": st.session_state.get("filter_myths", []),
+            "habitats": st.session_state.get("filter_habitats", []),
+            "danger": st.session_state.get("filter_danger", (1, 10)),
+        }
+        facets = api_utils.get_facets(build_filter_params(search_q, **current))
+        all_types, fmt_type = facet_options(facets["creature_type"], current["types"])
+        all_myths, fmt_myth = facet_options(facets["mythology"], current["myths"])
+        all_habitats, fmt_habitat = facet_options(
+            facets["habitat"], current["habitats"]
+        )
 
         # 2. Controls
-        sel_types = st.multiselect("Class", all_types)
-        sel_myths = st.multiselect("Mythology", all_myths)
-        sel_habitats = st.multiselect("Habitat", all_habitats)
-        sel_danger = st.slider("Danger Level", 1, 10, (1, 10))
-
-# Apply Filters
-filtered = creatures
-
-# Initial Search Filter
-if search_q:
-    filtered = [c for c in filtered if search_q.lower() in c["name"].lower()]
-
-# Advanced Filters
-if sel_types:
-    filtered = [c for c in filtered if c["creature_type"] in sel_types]
-if sel_myths:
-    filtered = [c for c in filtered if c["mythology"] in sel_myths]
-if sel_habitats:
-    filtered = [c for c in filtered if c.get("habitat", "Unknown") in sel_habitats]
-
-# Danger Range
-min_d, max_d = sel_danger
-filtered = [c for c in filtered if min_d <= c["danger_level"] <= max_d]
+        sel_types = st.multiselect(
+            "Class", all_types, key="filter_types", format_func=fmt_type
+        )
+        sel_myths = st.multiselect(
+            "Mythology", all_myths, key="filter_myths", format_func=fmt_myth
+        )
+        sel_habitats = st.multiselect(
+            "Habitat", all_habitats, key="filter_habitats", format_func=fmt_habitat
+        )
+        sel_danger = st.slider("Danger Level", 1, 10, (1, 10), key="filter_danger")
+
+# Apply Filters (server-side; the backend answers from its indexes)
+filter_params = build_filter_params(
+    search_q, sel_types, sel_myths, sel_habitats, sel_danger
+)
+
+# The list is loaded a page at a time; "Load more" adds the next page, and
+# changing the filters starts over from the first one.
+if st.session_state.get("pages_for") != filter_params:
+    st.session_state["pages_for"] = filter_params
+    st.session_state["pages"] = 1
+
+next_cursor = None
+if filter_params == (("q", search_q),):
+    # Plain name search: use the ranked search index. It answers at most
+    # SEARCH_LIMIT rows; when full, switch to the paged list endpoint so no
+    # match is dropped.
+    filtered = api_utils.search_creatures(search_q)
+    if len(filtered) >= api_client.SEARCH_LIMIT:
+        filtered, next_cursor = get_creatures(filter_params, st.session_state["pages"])
+else:
+    filtered, next_cursor = get_creatures(filter_params, st.session_state["pages"])
 
 # --- Table ---
 st.markdown('<div class="table-container">', unsafe_allow_html=True)
@@ -543,7 +567,8 @@ for c in filtered:
 
     # 1. Name
     with c1:
-        raw_path = c.get("image_url")  # e.g. "/static/creatures/22.png" (relative)
+        # e.g. "/static/creatures/22-<hash>.png" (relative)
+        raw_path = c.get("image_url")
         img_url = (
             urljoin(PUBLIC_BACKEND_URL, raw_path)
             if raw_path
@@ -563,14 +588,11 @@ for c in filtered:
     # 2. Class
     with c2:
         ctype = c["creature_type"]
-        # Dynamic Color Lookup
-        classes_data = get_classes()  # Cached
-
         # Default
         bg, text, border = "rgba(127,19,236,0.1)", "#ad92c9", "rgba(127,19,236,0.2)"
 
-        # Find matching class
-        match = next((x for x in classes_data if x["name"] == ctype), None)
+        # Class colors come embedded in the listing.
+        match = c.get("creature_class")
         if match:
             bg, text, border = (
                 match["color"],
@@ -652,3 +674,8 @@ for c in filtered:
 
 # Close container
 st.markdown("</div>", unsafe_allow_html=True)
+
+if next_cursor:
+    if st.button("Load more", key="load_more"):
+        st.session_state["pages"] += 1
+        st.rerun()
@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 import requests
 import sys
 import os
@@ -27,7 +27,10 @@ def test_streamlit_workflow_create_creature_then_visible_in_registry():
         "danger_level": 10,
     }
 
-    with patch("requests.post") as mock_post, patch("requests.get") as mock_get:
+    with (
+        patch("requests.Session.post") as mock_post,
+        patch("requests.Session.get") as mock_get,
+    ):
         # Setup Mocks
         mock_post.return_value.status_code = 200
         mock_post.return_value.json.return_value = new_creature
@@ -35,6 +38,7 @@ def test_streamlit_workflow_create_creature_then_visible_in_registry():
         # First get might be empty
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = [new_creature]
+        mock_get.return_value.links = {}  # single page
 
         # 1. Simulate Creation (Action)
         payload = {"name": "Workflow Dragon", "creature_type": "Draconic"}
@@ -55,7 +59,7 @@ def test_streamlit_backend_unreachable_shows_friendly_error_and_no_crash():
     Verify that if the backend is down, the app handles it gracefully
     (returns empty list instead of crashing).
     """
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         # Simulate connection error
         mock_get.side_effect = requests.exceptions.ConnectionError("Connection refused")
 
@@ -80,9 +84,10 @@ def test_summary_metric_matches_backend_count():
         {"id": 3, "name": "C", "danger_level": 5},
     ]
 
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = mock_data
+        mock_get.return_value.links = {}  # single page
 
         # Fetch data
         creatures = api_client.get_creatures()
@@ -92,3 +97,51 @@ def test_summary_metric_matches_backend_count():
 
         # Verify
         assert total_count == 3
+
+
+# --- Test 4: Conditional Polling (ETag) ---
+def test_polling_revalidates_with_etag_and_reuses_body_on_304():
+    """
+    Verify that a repeated poll sends If-None-Match and that a 304 answer
+    yields the previously received data.
+    """
+    api_client._conditional_cache.clear()
+    classes = [{"id": 1, "name": "Draconic"}]
+    ok = MagicMock(status_code=200, headers={"ETag": '"v1"'}, links={})
+    ok.json.return_value = classes
+    not_modified = MagicMock(status_code=304, headers={"ETag": '"v1"'}, links={})
+
+    with patch("requests.Session.get", side_effect=[ok, not_modified]) as mock_get:
+        assert api_client.get_classes() == classes
+        assert api_client.get_classes() == classes
+
+        first, second = mock_get.call_args_list
+        assert "If-None-Match" not in first.kwargs["headers"]
+        assert second.kwargs["headers"]["If-None-Match"] == '"v1"'
+        not_modified.json.assert_not_called()
+
+
+# --- Test 5: Paging (one page per call) ---
+def test_creature_page_returns_next_cursor_without_fetching_it():
+    """
+    Verify that a page fetch makes one request and hands back the cursor of
+    the next page from the `Link: rel="next"` header.
+    """
+    api_client._conditional_cache.clear()
+    first = MagicMock(status_code=200, headers={})
+    first.json.return_value = [{"id": 1, "name": "A"}]
+    first.links = {
+        "next": {"url": f"{api_client.API_URL}/creatures/?limit=1&cursor=abc%3D"}
+    }
+    last = MagicMock(status_code=200, headers={}, links={})
+    last.json.return_value = [{"id": 2, "name": "B"}]
+
+    with patch("requests.Session.get", side_effect=[first, last]) as mock_get:
+        page, cursor = api_client.get_creatures_page(limit=1)
+        assert page == [{"id": 1, "name": "A"}]
+        assert cursor == "abc="
+        assert mock_get.call_count == 1
+
+        page, cursor = api_client.get_creatures_page(cursor=cursor, limit=1)
+        assert page == [{"id": 2, "name": "B"}] and cursor is None
+        assert mock_get.call_args.kwargs["params"]["cursor"] == "abc="